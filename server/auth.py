@@ -1,3 +1,5 @@
+import hmac
+
 from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
@@ -5,16 +7,25 @@ from .config import settings
 
 _bearer = HTTPBearer()
 
+# Settings are read once at import, so the expected token is encoded once
+# here rather than re-read through the settings object on every request.
+_EXPECTED_TOKEN = settings.auth_token.encode()
+
+
+def token_matches(candidate: str) -> bool:
+    """Constant-time check of a presented token against the server token."""
+    return hmac.compare_digest(candidate.encode(), _EXPECTED_TOKEN)
+
 
 async def verify_token(
     creds: HTTPAuthorizationCredentials = Depends(_bearer),
 ) -> str:
-    if creds.credentials != settings.auth_token:
+    if not token_matches(creds.credentials):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
     return creds.credentials
 
 
 async def verify_ws_token(token: str = Query(...)) -> str:
-    if token != settings.auth_token:
+    if not token_matches(token):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
     return token
@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import sys
-import urllib.request
-import urllib.error
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import orjson
+
+# httpx and urllib.request cost ~60 ms of import between them and only the
+# handoff / pull subcommands use them, so they're imported there rather than
+# on every `octopus` invocation.
+if TYPE_CHECKING:
+    import httpx
 
 
 def get_project_dir(cwd: str | None = None) -> Path:
@@ -18,50 +27,160 @@ def get_project_dir(cwd: str | None = None) -> Path:
     return Path.home() / ".claude" / "projects" / escaped
 
 
+# Session previews are cached next to the transcripts, keyed by file name and
+# validated against (mtime_ns, size), so re-running `handoff` costs one stat()
+# per unchanged session instead of re-reading its JSONL.
+_PREVIEW_CACHE_NAME = ".octopus-preview-cache.json"
+_PREVIEW_CACHE_MAX_ENTRIES = 500
+_PREVIEW_SCAN_WORKERS = 8
+
+
 def discover_sessions(project_dir: Path) -> list[dict]:
     """Find JSONL session files and return basic info about each."""
     if not project_dir.is_dir():
         return []
 
-    sessions = []
+    cache = _load_preview_cache(project_dir)
+    found: list[tuple[Path, os.stat_result, str | None]] = []
     for jsonl_path in sorted(project_dir.glob("*.jsonl")):
-        session_id = jsonl_path.stem
-        preview = _get_session_preview(jsonl_path)
+        try:
+            st = jsonl_path.stat()
+        except OSError:
+            continue
+        entry = cache.get(jsonl_path.name)
+        preview = None
+        if (
+            isinstance(entry, dict)
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+            and isinstance(entry.get("preview"), str)
+        ):
+            preview = entry["preview"]
+        found.append((jsonl_path, st, preview))
+
+    # Cache misses (first run, or transcripts that grew) are read in
+    # parallel — the scan is mostly file IO, which releases the GIL.
+    misses = [path for path, _, preview in found if preview is None]
+    if len(misses) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(_PREVIEW_SCAN_WORKERS, len(misses))
+        ) as pool:
+            scanned = dict(zip(misses, pool.map(_get_session_preview, misses)))
+    else:
+        scanned = {path: _get_session_preview(path) for path in misses}
+
+    fresh: dict[str, dict] = {}
+    sessions = []
+    for jsonl_path, st, preview in found:
+        if preview is None:
+            preview = scanned[jsonl_path]
+        fresh[jsonl_path.name] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "preview": preview,
+        }
         sessions.append({
-            "session_id": session_id,
+            "session_id": jsonl_path.stem,
             "path": jsonl_path,
             "preview": preview,
         })
+
+    if len(fresh) > _PREVIEW_CACHE_MAX_ENTRIES:
+        newest = sorted(fresh.items(), key=lambda kv: kv[1]["mtime_ns"], reverse=True)
+        fresh = dict(newest[:_PREVIEW_CACHE_MAX_ENTRIES])
+    if fresh != cache:
+        _save_preview_cache(project_dir, fresh)
     return sessions
 
 
+def _load_preview_cache(project_dir: Path) -> dict:
+    """Read the preview cache; a missing or corrupt file is an empty cache."""
+    try:
+        data = orjson.loads((project_dir / _PREVIEW_CACHE_NAME).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_preview_cache(project_dir: Path, cache: dict) -> None:
+    """Atomically replace the preview cache. Best-effort: a read-only
+    project dir just means previews are recomputed next time."""
+    tmp_path: str | None = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=project_dir, prefix=_PREVIEW_CACHE_NAME, delete=False
+        ) as f:
+            tmp_path = f.name
+            f.write(orjson.dumps(cache))
+        os.replace(tmp_path, project_dir / _PREVIEW_CACHE_NAME)
+    except OSError:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+# Claude Code writes the first user message at the top of a transcript, so the
+# preview scan reads a small head first, widens in larger steps, and gives up
+# after _PREVIEW_MAX_BYTES rather than streaming a multi-MB session to the end.
+_PREVIEW_FIRST_READ = 64 * 1024
+_PREVIEW_NEXT_READ = 256 * 1024
+_PREVIEW_MAX_BYTES = 1024 * 1024
+
+
 def _get_session_preview(path: Path) -> str:
     """Extract first user message from a JSONL file as a preview."""
     try:
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if data.get("type") != "user":
-                    continue
-                message = data.get("message", {})
-                content = message.get("content")
-                if isinstance(content, str):
-                    return content[:100]
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "text":
-                            return block.get("text", "")[:100]
+        with path.open("rb") as f:
+            buf = b""
+            read_size = _PREVIEW_FIRST_READ
+            total = 0
+            while True:
+                chunk = f.read(min(read_size, _PREVIEW_MAX_BYTES - total))
+                if chunk:
+                    total += len(chunk)
+                    lines = (buf + chunk).split(b"\n")
+                    buf = lines.pop()
+                else:
+                    lines, buf = [buf], b""  # EOF: last line had no newline
+                for line in lines:
+                    preview = _preview_from_line(line)
+                    if preview is not None:
+                        return preview
+                if not chunk or total >= _PREVIEW_MAX_BYTES:
+                    break
+                read_size = _PREVIEW_NEXT_READ
     except OSError:
         pass
     return "(no preview)"
 
 
+def _preview_from_line(line: bytes) -> str | None:
+    """The preview text if `line` is a user message with text, else None."""
+    # Summary / file-history / assistant lines (often the bulk of the head,
+    # and the largest) can't be the preview; skip them without building
+    # their object tree.
+    if b'"user"' not in line:
+        return None
+    try:
+        data = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or data.get("type") != "user":
+        return None
+    content = (data.get("message") or {}).get("content")
+    if isinstance(content, str):
+        return content[:100]
+    if isinstance(content, list):
+        return next(
+            (
+                block.get("text", "")[:100]
+                for block in content
+                if isinstance(block, dict) and block.get("type") == "text"
+            ),
+            None,
+        )
+    return None
+
+
 def build_import_payload(
     jsonl_path: Path, name: str | None = None
 ) -> dict:
@@ -77,23 +196,82 @@ def build_import_payload(
         "name": name or f"Handoff: {(meta.first_user_message or 'session')[:60]}",
         "working_dir": meta.cwd,
         "claude_session_id": meta.session_id,
-        "messages": [msg.model_dump(exclude_none=True) for msg in parsed.messages],
+        "messages": [msg.to_payload() for msg in parsed.messages],
     }
 
 
-def do_handoff(args: argparse.Namespace) -> None:
-    """Execute the handoff subcommand."""
+def _handoff_client(server: str, token: str) -> httpx.Client:
+    """A keep-alive client for POSTing imports, so a batch handoff reuses one
+    connection (and TLS session) instead of reconnecting per session.
+    Connection failures are retried; HTTP errors are not."""
+    import httpx
+
+    return httpx.Client(
+        base_url=server,
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token}",
+        },
+        timeout=30.0,
+        transport=httpx.HTTPTransport(retries=3),
+    )
+
+
+def _print_connect_error(server: str) -> None:
+    print(f"Error: Could not connect to {server}", file=sys.stderr)
+    print(f"  Is the Octopus server running? Start it with:", file=sys.stderr)
+    print(f"    octopus serve", file=sys.stderr)
+    print(f"  Or with Cloudflare Tunnel:", file=sys.stderr)
+    print(f"    octopus serve --tunnel", file=sys.stderr)
+
+
+def _post_import(client: httpx.Client, server: str, payload: dict) -> bool:
+    """POST one import payload and report the result. Returns False on an
+    HTTP error (already printed); connection failures propagate."""
+    msg_count = len(payload["messages"])
+    print(f"Importing session with {msg_count} messages...")
+    resp = client.post("/api/sessions/import", content=orjson.dumps(payload))
+    if resp.is_error:
+        print(f"Error: HTTP {resp.status_code} — {resp.text}", file=sys.stderr)
+        return False
+    result = orjson.loads(resp.content)
+    print(f"Session imported: {result['id']}")
+    print(f"  Name: {result['name']}")
+    print(f"  Messages: {result['message_count']}")
+    print(f"  URL: {server}/sessions/{result['id']}")
+    return True
+
+
+def do_handoff(
+    args: argparse.Namespace, client: httpx.Client | None = None
+) -> None:
+    """Execute the handoff subcommand.
+
+    `client` is injectable for tests; by default one pooled client is
+    created and shared by every POST of this invocation.
+    """
+    import httpx
+
     server = args.server.rstrip("/")
-    token = args.token
 
     # Determine project dir
     project_dir = Path(args.project_dir) if args.project_dir else get_project_dir()
 
-    if args.session_id:
+    if args.batch:
+        # Import every discovered session over one connection.
+        sessions = discover_sessions(project_dir)
+        if not sessions:
+            print(f"No sessions found in {project_dir}", file=sys.stderr)
+            sys.exit(1)
+        paths = [s["path"] for s in sessions]
+        name = None
+    elif args.session_id:
         jsonl_path = project_dir / f"{args.session_id}.jsonl"
         if not jsonl_path.exists():
             print(f"Error: Session file not found: {jsonl_path}", file=sys.stderr)
             sys.exit(1)
+        paths = [jsonl_path]
+        name = args.name
     else:
         # Discover and let user pick
         sessions = discover_sessions(project_dir)
@@ -115,48 +293,36 @@ def do_handoff(args: argparse.Namespace) -> None:
             print("\nAborted.", file=sys.stderr)
             sys.exit(1)
 
-        jsonl_path = sessions[idx]["path"]
-
-    # Build payload
-    payload = build_import_payload(jsonl_path, name=args.name)
-    msg_count = len(payload["messages"])
-    print(f"Importing session with {msg_count} messages...")
-
-    # POST to server
-    url = f"{server}/api/sessions/import"
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {token}",
-        },
-        method="POST",
-    )
+        paths = [sessions[idx]["path"]]
+        name = args.name
 
+    owns_client = client is None
+    if client is None:
+        client = _handoff_client(server, args.token)
+    failed = 0
     try:
-        with urllib.request.urlopen(req) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-            print(f"Session imported: {result['id']}")
-            print(f"  Name: {result['name']}")
-            print(f"  Messages: {result['message_count']}")
-            print(f"  URL: {server}/sessions/{result['id']}")
-    except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")
-        print(f"Error: HTTP {e.code} — {body}", file=sys.stderr)
+        for jsonl_path in paths:
+            payload = build_import_payload(jsonl_path, name=name)
+            if not _post_import(client, server, payload):
+                failed += 1
+    except httpx.TransportError:
+        _print_connect_error(server)
         sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"Error: Could not connect to {server}", file=sys.stderr)
-        print(f"  Is the Octopus server running? Start it with:", file=sys.stderr)
-        print(f"    octopus serve", file=sys.stderr)
-        print(f"  Or with Cloudflare Tunnel:", file=sys.stderr)
-        print(f"    octopus serve --tunnel", file=sys.stderr)
+    finally:
+        if owns_client:
+            client.close()
+
+    if failed:
+        if len(paths) > 1:
+            print(f"{failed} of {len(paths)} imports failed.", file=sys.stderr)
         sys.exit(1)
 
 
 def do_pull(args: argparse.Namespace) -> None:
     """Execute the pull subcommand — fetch a session from Octopus and write as JSONL."""
+    import urllib.error
+    import urllib.request
+
     from .harness import get_harness
     from .models import MessageContent
 
@@ -174,7 +340,7 @@ def do_pull(args: argparse.Namespace) -> None:
 
     try:
         with urllib.request.urlopen(req) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+            data = orjson.loads(resp.read())
     except urllib.error.HTTPError as e:
         body = e.read().decode("utf-8", errors="replace")
         print(f"Error: HTTP {e.code} — {body}", file=sys.stderr)
@@ -202,7 +368,7 @@ def do_pull(args: argparse.Namespace) -> None:
         print(f"Note: No claude_session_id on server — generated {claude_session_id}")
 
     working_dir = args.cwd or data.get("working_dir") or str(Path.cwd())
-    messages = [MessageContent(**msg) for msg in data.get("messages", [])]
+    messages = [MessageContent.model_validate(msg) for msg in data.get("messages", [])]
 
     if not messages:
         print("Warning: Session has no messages.", file=sys.stderr)
@@ -234,7 +400,6 @@ def do_serve(args: argparse.Namespace) -> None:
     # We set the env var (not the Settings object) so the value survives
     # uvicorn's reload, which re-imports the module and creates a fresh Settings().
     if getattr(args, "tunnel", None) is not None:
-        import os
         os.environ["OCTOPUS_ENABLE_TUNNEL"] = str(args.tunnel).lower()
 
     from .main import run
@@ -262,10 +427,16 @@ def build_parser() -> argparse.ArgumentParser:
     handoff_parser = subparsers.add_parser(
         "handoff", help="Import a local Claude Code session"
     )
-    handoff_parser.add_argument(
+    handoff_target = handoff_parser.add_mutually_exclusive_group()
+    handoff_target.add_argument(
         "--session-id",
         help="Claude Code session UUID (skips interactive selection)",
     )
+    handoff_target.add_argument(
+        "--batch",
+        action="store_true",
+        help="Import every session in the project directory over one connection",
+    )
     handoff_parser.add_argument(
         "--project-dir",
         help="Path to Claude Code project directory (default: auto-detect from cwd)",
@@ -319,6 +490,9 @@ def main() -> None:
     """CLI entry point."""
     parser = build_parser()
     args = parser.parse_args()
+    if args.command == "handoff" and args.batch and args.name:
+        # One name can't label every session of a batch.
+        parser.error("argument --name: not allowed with argument --batch")
 
     if args.command is None or args.command == "serve":
         do_serve(args)
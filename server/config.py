@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +11,11 @@ class Settings(BaseSettings):
     default_working_dir: str = "."
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:8000"]
     db_path: str = "octopus.db"
+    # SQLite durability/IO knobs. NORMAL under WAL can lose the last few
+    # commits on power loss but never corrupts; OFF suits throwaway
+    # deployments. mmap_size lets reads come straight from the page cache.
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
     # User-uploaded attachments live here, one subdir per session_id.
     # `~` is expanded at use time (not config load time) so tests that
     # override $HOME via monkeypatch see the override.
@@ -73,6 +81,12 @@ class Settings(BaseSettings):
 
     model_config = {"env_prefix": "OCTOPUS_", "env_file": ".env"}
 
+    @field_validator("sqlite_synchronous", mode="before")
+    @classmethod
+    def _upper_sqlite_synchronous(cls, v: object) -> object:
+        # SQLite (and Database) take the level in any case.
+        return v.upper() if isinstance(v, str) else v
+
     @property
     def resolved_public_base_url(self) -> str:
         """Base URL for OAuth redirect URIs — explicit config or localhost."""
@@ -3,11 +3,14 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import sqlite3
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from typing import Any
 
 import aiosqlite
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -342,16 +345,218 @@ CREATE INDEX IF NOT EXISTS idx_research_jobs_session
 """
 
 
+# sqlite3 keeps prepared statements in a per-connection LRU keyed by SQL text.
+# This module issues ~100 static statements plus per-field-set UPDATE
+# variants, which crowds the default 128-entry cache; size it so hot
+# statements stay prepared.
+_STATEMENT_CACHE_SIZE = 512
+
+# Hot-path statements live at module level so every call hands sqlite3 the
+# identical SQL text and hits its prepared-statement cache.
+_SELECT_MESSAGES_SQL = (
+    "SELECT seq, role, type, content, tool_name, tool_input, tool_use_id, "
+    "is_error, session_id_ref, cost, attachments, git_head, "
+    "git_status_clean "
+    "FROM messages WHERE session_id = ? ORDER BY seq"
+)
+_SELECT_MESSAGES_PAGE_SQL = _SELECT_MESSAGES_SQL + " LIMIT ? OFFSET ?"
+_SELECT_MESSAGES_RANGE_SQL = (
+    "SELECT seq, role, type, content, tool_name, tool_input, tool_use_id, "
+    "is_error, session_id_ref, cost, attachments, git_head, "
+    "git_status_clean "
+    "FROM messages WHERE session_id = ? AND seq BETWEEN ? AND ? ORDER BY seq"
+)
+# Rows fetched and decoded per step of iter_messages.
+_ITER_MESSAGES_BATCH = 256
+# Upper bound for an open-ended seq range (SQLite's max INTEGER).
+_MAX_SEQ = 2**63 - 1
+
+
+# load_sessions / load_session result keys, in SELECT order. The row tuples
+# are zipped straight into dicts; origin/backend defaults are applied in SQL.
+_SESSION_COLUMNS = (
+    "id", "name", "working_dir", "created_at", "claude_session_id",
+    "credential_id", "archived", "agent_id", "origin", "backend",
+    "parent_session_id", "delegation_request", "forked_from_session_id",
+    "fork_after_seq", "fork_needs_replay", "fork_metadata",
+    "fork_revert_record", "fork_status",
+)
+_SELECT_SESSIONS_SQL = (
+    "SELECT id, name, working_dir, created_at, claude_session_id, "
+    "credential_id, archived, agent_id, COALESCE(NULLIF(origin, ''), 'user'), "
+    "COALESCE(NULLIF(backend, ''), 'claude-code'), "
+    "parent_session_id, delegation_request, forked_from_session_id, "
+    "fork_after_seq, fork_needs_replay, fork_metadata, "
+    "fork_revert_record, fork_status FROM sessions"
+)
+
+
+# update_session_field accepts only these columns.
+_SESSION_UPDATABLE = frozenset({
+    "name",
+    "working_dir",
+    "claude_session_id",
+    "credential_id",
+    "archived",
+    "agent_id",
+    "origin",
+    "backend",
+    # Fork columns (session-rewind.md §4). fork_metadata is
+    # nullable+clearable (set to None to clear after first turn);
+    # the others are written across the §5.1 saga.
+    "forked_from_session_id",
+    "fork_after_seq",
+    "fork_needs_replay",
+    "fork_metadata",
+    "fork_revert_record",
+    "fork_status",
+})
+# Columns that must be writable to NULL. `fork_metadata` clears after
+# the fork's first result; `claude_session_id` must be clearable so a
+# HISTORY_REPLAY fork (Codex) can overwrite the pre-minted resume_id
+# hint with NULL post-prepare_fork — otherwise a restart before the
+# first turn reloads the bogus hint and spawns `codex resume <bogus>`
+# (Vera review BLOCKING #1). Other columns omitted by the caller are
+# left untouched.
+_SESSION_NULLABLE = frozenset({"fork_metadata", "claude_session_id"})
+_SESSION_BOOL_FIELDS = frozenset({"archived", "fork_needs_replay"})
+_UPDATE_SESSION_SQL = {
+    column: f"UPDATE sessions SET {column} = ? WHERE id = ?"
+    for column in _SESSION_UPDATABLE
+}
+
+
+def _session_from_row(row: tuple[Any, ...]) -> dict[str, Any]:
+    session = dict(zip(_SESSION_COLUMNS, row))
+    session["archived"] = bool(session["archived"])
+    session["fork_needs_replay"] = bool(session["fork_needs_replay"])
+    return session
+
+
+# append_message writes its buffered rows once this many accumulate, so a
+# very long turn doesn't hold an unbounded batch until its final flush.
+_PENDING_MESSAGES_MAX = 64
+
+
+# load_messages decodes results of at least this many rows on a worker
+# thread; below it the thread hop costs more than the parsing it saves.
+_DECODE_OFFLOAD_MIN_ROWS = 256
+
+
+def _decode_message_rows(rows: list[tuple[Any, ...]]) -> list[dict[str, Any]]:
+    """Turn `_SELECT_MESSAGES_SQL` rows into load_messages dicts."""
+    loads = orjson.loads
+    return [
+        {
+            "seq": row[0],
+            "role": row[1],
+            "type": row[2],
+            "content": loads(row[3]) if row[3] is not None else None,
+            "tool_name": row[4],
+            "tool_input": loads(row[5]) if row[5] is not None else None,
+            "tool_use_id": row[6],
+            "is_error": bool(row[7]) if row[7] is not None else None,
+            "session_id": row[8],
+            "cost": row[9],
+            "attachments": loads(row[10]) if row[10] is not None else [],
+            "git_head": row[11],
+            "git_status_clean": bool(row[12]) if row[12] is not None else None,
+        }
+        for row in rows
+    ]
+
+
+def _dumps_json(value: Any) -> str:
+    """JSON-encode a message column. orjson is several times faster than
+    the stdlib on the large tool inputs/results messages carry;
+    OPT_NON_STR_KEYS keeps json.dumps' coercion of int/enum dict keys."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_INSERT_MESSAGE_SQL = (
+    "INSERT INTO messages "
+    "(session_id, seq, role, type, content, tool_name, tool_input, "
+    "tool_use_id, is_error, session_id_ref, cost, attachments, "
+    "git_head, git_status_clean) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _message_row(
+    session_id: str,
+    seq: int,
+    role: str,
+    type: str,
+    content: Any = None,
+    tool_name: str | None = None,
+    tool_input: dict[str, Any] | None = None,
+    tool_use_id: str | None = None,
+    is_error: bool | None = None,
+    session_id_ref: str | None = None,
+    cost: float | None = None,
+    attachments: list[dict[str, Any]] | None = None,
+    git_head: str | None = None,
+    git_status_clean: bool | None = None,
+) -> tuple[Any, ...]:
+    """Serialize one message into the `_INSERT_MESSAGE_SQL` parameter tuple."""
+    return (
+        session_id,
+        seq,
+        role,
+        type,
+        _dumps_json(content) if content is not None else None,
+        tool_name,
+        _dumps_json(tool_input) if tool_input is not None else None,
+        tool_use_id,
+        int(is_error) if is_error is not None else None,
+        session_id_ref,
+        cost,
+        _dumps_json(attachments) if attachments else None,
+        git_head,
+        int(git_status_clean) if git_status_clean is not None else None,
+    )
+
+
+# Accepted values for PRAGMA synchronous (interpolated, so checked up front).
+_SYNCHRONOUS_LEVELS = frozenset({"OFF", "NORMAL", "FULL", "EXTRA"})
+
+
 class Database:
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self, db_path: str, *, synchronous: str = "NORMAL", mmap_size: int = 0
+    ) -> None:
         self._db_path = db_path
+        level = str(synchronous).upper()
+        if level not in _SYNCHRONOUS_LEVELS:
+            raise ValueError(
+                f"synchronous must be one of {sorted(_SYNCHRONOUS_LEVELS)}, "
+                f"got {synchronous!r}"
+            )
+        self._synchronous = level
+        self._mmap_size = int(mmap_size)
         self._conn: aiosqlite.Connection | None = None
         self._dirty: bool = False
+        # Rows from append_message not yet handed to SQLite, keyed by
+        # session so one session's bad rows can't take the others down; see
+        # _write_pending_messages.
+        self._pending_messages: dict[str, list[tuple[Any, ...]]] = {}
         self._closed: bool = False
 
     async def initialize(self) -> None:
-        self._conn = await aiosqlite.connect(self._db_path)
+        self._conn = await aiosqlite.connect(
+            self._db_path, cached_statements=_STATEMENT_CACHE_SIZE
+        )
         await self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL (the default) durable against corruption (a power
+        # cut can only lose the last commits, never the database) while
+        # skipping the fsync-per-commit FULL costs on the per-turn message
+        # writes. PRAGMAs take no bound parameters; __init__ checks the
+        # synchronous level against _SYNCHRONOUS_LEVELS and coerces mmap_size
+        # to int.
+        await self._conn.execute(f"PRAGMA synchronous={self._synchronous}")
+        await self._conn.execute(f"PRAGMA mmap_size={self._mmap_size}")
+        await self._conn.execute("PRAGMA temp_store=MEMORY")
+        await self._conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
         await self._conn.execute("PRAGMA foreign_keys=ON")
         await self._conn.executescript(_SCHEMA)
         await self._apply_migrations()
@@ -491,6 +696,14 @@ class Database:
             )
         except Exception:
             pass
+        # load_agents / get_agent count each agent's live sessions with a
+        # correlated subquery; without this it scans sessions once per agent.
+        # Created here rather than in _SCHEMA because agent_id arrives via
+        # _migrate_agents on pre-agent databases.
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_agent "
+            "ON sessions(agent_id, archived)"
+        )
 
         # Backfill default built-in MCP servers into every existing agent's
         # mcp_servers list as new ones land (`ask_agent` —
@@ -741,6 +954,7 @@ class Database:
 
     async def close(self) -> None:
         if self._conn:
+            await self._write_pending_messages()
             if self._dirty:
                 await self._conn.commit()
                 self._dirty = False
@@ -751,6 +965,7 @@ class Database:
     async def flush(self) -> None:
         """Commit pending writes."""
         await self._ensure_connected()
+        await self._write_pending_messages()
         if self._dirty:
             await self._conn.commit()
             self._dirty = False
@@ -799,6 +1014,9 @@ class Database:
 
     async def delete_session(self, session_id: str) -> None:
         await self._ensure_connected()
+        # The cascade would remove them anyway; writing them first could
+        # only fail.
+        self._pending_messages.pop(session_id, None)
         await self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
         await self._conn.commit()
 
@@ -829,6 +1047,9 @@ class Database:
         row insert rather than leaving an open transaction a later commit would
         flush (Vera review SHOULD-FIX #1)."""
         await self._ensure_connected()
+        # Commit buffered/deferred writes first: the copy must see them,
+        # and the rollback below must not discard them.
+        await self.flush()
         try:
             await self._conn.execute(
                 "INSERT INTO sessions "
@@ -864,49 +1085,44 @@ class Database:
         self, *, include_archived: bool = False
     ) -> list[dict[str, Any]]:
         await self._ensure_connected()
-        query = (
-            "SELECT id, name, working_dir, created_at, claude_session_id, "
-            "credential_id, archived, agent_id, origin, backend, "
-            "parent_session_id, delegation_request, forked_from_session_id, "
-            "fork_after_seq, fork_needs_replay, fork_metadata, "
-            "fork_revert_record, fork_status FROM sessions"
-        )
+        query = _SELECT_SESSIONS_SQL
         if not include_archived:
             query += " WHERE archived = 0"
         cursor = await self._conn.execute(query)
         rows = await cursor.fetchall()
-        return [
-            {
-                "id": row[0],
-                "name": row[1],
-                "working_dir": row[2],
-                "created_at": row[3],
-                "claude_session_id": row[4],
-                "credential_id": row[5],
-                "archived": bool(row[6]),
-                "agent_id": row[7],
-                "origin": row[8] or "user",
-                "backend": row[9] or "claude-code",
-                "parent_session_id": row[10],
-                "delegation_request": row[11],
-                "forked_from_session_id": row[12],
-                "fork_after_seq": row[13],
-                "fork_needs_replay": bool(row[14]),
-                "fork_metadata": row[15],
-                "fork_revert_record": row[16],
-                "fork_status": row[17],
-            }
-            for row in rows
-        ]
+        return [_session_from_row(row) for row in rows]
+
+    async def load_session(self, session_id: str) -> dict[str, Any] | None:
+        """One `load_sessions`-shaped row by id (archived or not), via the
+        primary key rather than loading and scanning every session."""
+        await self._ensure_connected()
+        cursor = await self._conn.execute(
+            _SELECT_SESSIONS_SQL + " WHERE id = ?", (session_id,)
+        )
+        row = await cursor.fetchone()
+        return _session_from_row(row) if row is not None else None
 
     async def count_messages(self, session_id: str) -> int:
         await self._ensure_connected()
+        await self._write_pending_messages(session_id)
         cursor = await self._conn.execute(
             "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
         )
         row = await cursor.fetchone()
         return row[0]
 
+    async def count_messages_by_session(self) -> dict[str, int]:
+        """Message count for every session that has messages, in one grouped
+        scan of the (session_id, seq) index — for callers that would
+        otherwise issue `count_messages` per session. Sessions with no
+        messages are absent."""
+        await self._ensure_connected()
+        await self._write_pending_messages()
+        cursor = await self._conn.execute(
+            "SELECT session_id, COUNT(*) FROM messages GROUP BY session_id"
+        )
+        return dict(await cursor.fetchall())
+
     async def append_message(
         self,
         session_id: str,
@@ -924,84 +1140,163 @@ class Database:
         git_head: str | None = None,
         git_status_clean: bool | None = None,
     ) -> None:
-        await self._ensure_connected()
-        content_str = json.dumps(content) if content is not None else None
-        tool_input_str = json.dumps(tool_input) if tool_input is not None else None
-        is_error_int = int(is_error) if is_error is not None else None
-        attachments_str = (
-            json.dumps(attachments) if attachments else None
-        )
-        git_status_clean_int = (
-            int(git_status_clean) if git_status_clean is not None else None
-        )
-
-        await self._conn.execute(
-            "INSERT INTO messages "
-            "(session_id, seq, role, type, content, tool_name, tool_input, "
-            "tool_use_id, is_error, session_id_ref, cost, attachments, "
-            "git_head, git_status_clean) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (
+        """Buffer one message row. Rows reach SQLite in a single executemany
+        at the next flush() (end of turn, or any read of the messages
+        table) or once _PENDING_MESSAGES_MAX accumulate — a streamed turn
+        otherwise cost one worker-thread round-trip per block."""
+        await self._ensure_connected()
+        pending = self._pending_messages.setdefault(session_id, [])
+        pending.append(
+            _message_row(
                 session_id,
                 seq,
                 role,
                 type,
-                content_str,
-                tool_name,
-                tool_input_str,
-                tool_use_id,
-                is_error_int,
-                session_id_ref,
-                cost,
-                attachments_str,
-                git_head,
-                git_status_clean_int,
+                content=content,
+                tool_name=tool_name,
+                tool_input=tool_input,
+                tool_use_id=tool_use_id,
+                is_error=is_error,
+                session_id_ref=session_id_ref,
+                cost=cost,
+                attachments=attachments,
+                git_head=git_head,
+                git_status_clean=git_status_clean,
             ),
         )
-        self._dirty = True
+        if len(pending) >= _PENDING_MESSAGES_MAX:
+            await self._write_pending_messages(session_id)
+
+    async def _write_pending_messages(self, session_id: str | None = None) -> None:
+        """Insert buffered append_message rows for `session_id`, or for every
+        session (uncommitted, like any other deferred write). Every method
+        that reads or copies message rows calls this first so the buffer is
+        never observable.
+
+        Each session is written with its own executemany. If SQLite rejects
+        a row (e.g. its session was deleted mid-turn) the rest of that
+        session's batch is salvaged row by row, see _salvage_pending_rows;
+        on any other error the unwritten rows go back in the buffer before
+        re-raising."""
+        if session_id is None:
+            session_ids = list(self._pending_messages)
+        elif session_id in self._pending_messages:
+            session_ids = [session_id]
+        else:
+            return
+        for sid in session_ids:
+            rows = self._pending_messages.pop(sid)
+            try:
+                await self._conn.executemany(_INSERT_MESSAGE_SQL, rows)
+            except sqlite3.IntegrityError:
+                await self._salvage_pending_rows(sid, rows)
+            except BaseException:
+                self._pending_messages[sid] = rows + self._pending_messages.get(sid, [])
+                raise
+            self._dirty = True
+
+    async def _salvage_pending_rows(
+        self, session_id: str, rows: list[tuple[Any, ...]]
+    ) -> None:
+        """Finish a batch that executemany aborted on a constraint violation.
+        The rows ahead of the rejected one are already inserted; seq is
+        assigned per session in increasing order, so those are the batch's
+        seqs now present in the table. Insert the others one at a time and
+        log only the rows SQLite actually rejects."""
+        seqs = [row[1] for row in rows if isinstance(row[1], int)]
+        written: set[int] = set()
+        if seqs:
+            cursor = await self._conn.execute(
+                "SELECT seq FROM messages WHERE session_id = ? AND seq >= ?",
+                (session_id, min(seqs)),
+            )
+            written = {seq for (seq,) in await cursor.fetchall()}
+        rejected: list[Any] = []
+        error: sqlite3.IntegrityError | None = None
+        for row in rows:
+            if row[1] in written:
+                continue
+            try:
+                await self._conn.execute(_INSERT_MESSAGE_SQL, row)
+            except sqlite3.IntegrityError as e:
+                rejected.append(row[1])
+                error = e
+        if rejected:
+            logger.warning(
+                "Dropped %d of %d buffered message(s) for session %s "
+                "(seq %s): %s",
+                len(rejected),
+                len(rows),
+                session_id,
+                ", ".join(map(str, rejected)),
+                error,
+            )
+
+    async def append_messages(
+        self, session_id: str, messages: list[dict[str, Any]]
+    ) -> None:
+        """Bulk form of `append_message` for the import path: one
+        `executemany` and one commit for the whole batch instead of a
+        worker-thread round-trip per row. Each dict carries the same keyword
+        fields `append_message` takes (`seq`, `role`, `type` required)."""
+        await self._ensure_connected()
+        if not messages:
+            return
+        # This session's buffered append_message rows ride along in the same
+        # executemany, ahead of the batch so seq order is preserved; other
+        # sessions' stay buffered.
+        pending = self._pending_messages.pop(session_id, [])
+        rows = pending + [_message_row(session_id, **m) for m in messages]
+        try:
+            await self._conn.executemany(_INSERT_MESSAGE_SQL, rows)
+        except BaseException:
+            if pending:
+                self._pending_messages[session_id] = pending
+            raise
+        await self._conn.commit()
+        self._dirty = False
 
     async def load_messages(
         self, session_id: str, limit: int = 0, offset: int = 0
     ) -> list[dict[str, Any]]:
         await self._ensure_connected()
         await self.flush()  # ensure pending writes are visible
-        query = (
-            "SELECT seq, role, type, content, tool_name, tool_input, tool_use_id, "
-            "is_error, session_id_ref, cost, attachments, git_head, "
-            "git_status_clean "
-            "FROM messages WHERE session_id = ? ORDER BY seq"
-        )
-        params: list = [session_id]
         if limit > 0:
-            query += " LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
-        cursor = await self._conn.execute(query, params)
-        rows = await cursor.fetchall()
-        results = []
-        for row in rows:
-            content = json.loads(row[3]) if row[3] is not None else None
-            tool_input = json.loads(row[5]) if row[5] is not None else None
-            is_error = bool(row[7]) if row[7] is not None else None
-            attachments = json.loads(row[10]) if row[10] is not None else []
-            git_status_clean = bool(row[12]) if row[12] is not None else None
-            results.append(
-                {
-                    "seq": row[0],
-                    "role": row[1],
-                    "type": row[2],
-                    "content": content,
-                    "tool_name": row[4],
-                    "tool_input": tool_input,
-                    "tool_use_id": row[6],
-                    "is_error": is_error,
-                    "session_id": row[8],
-                    "cost": row[9],
-                    "attachments": attachments,
-                    "git_head": row[11],
-                    "git_status_clean": git_status_clean,
-                }
+            cursor = await self._conn.execute(
+                _SELECT_MESSAGES_PAGE_SQL, (session_id, limit, offset)
             )
-        return results
+        else:
+            cursor = await self._conn.execute(_SELECT_MESSAGES_SQL, (session_id,))
+        rows = await cursor.fetchall()
+        if len(rows) < _DECODE_OFFLOAD_MIN_ROWS:
+            return _decode_message_rows(rows)
+        # A long session is thousands of JSON parses; run them on a worker
+        # thread so other requests aren't stalled behind one history load.
+        return await asyncio.to_thread(_decode_message_rows, rows)
+
+    async def iter_messages(
+        self,
+        session_id: str,
+        *,
+        min_seq: int = 0,
+        max_seq: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield `load_messages`-shaped dicts with `min_seq <= seq <= max_seq`
+        in seq order. The range is applied in SQL and rows are fetched and
+        decoded a batch at a time, so callers that only want part of a long
+        history never materialize the rest."""
+        await self._ensure_connected()
+        await self.flush()
+        upper = _MAX_SEQ if max_seq is None else max_seq
+        cursor = await self._conn.execute(
+            _SELECT_MESSAGES_RANGE_SQL, (session_id, min_seq, upper)
+        )
+        try:
+            while rows := await cursor.fetchmany(_ITER_MESSAGES_BATCH):
+                for message in _decode_message_rows(rows):
+                    yield message
+        finally:
+            await cursor.close()
 
     # --- Bridge mappings ---
 
@@ -1748,49 +2043,26 @@ class Database:
 
     async def update_session_field(self, session_id: str, **fields: Any) -> None:
         await self._ensure_connected()
-        allowed = {
-            "name",
-            "working_dir",
-            "claude_session_id",
-            "credential_id",
-            "archived",
-            "agent_id",
-            "origin",
-            "backend",
-            # Fork columns (session-rewind.md §4). fork_metadata is
-            # nullable+clearable (set to None to clear after first turn);
-            # the others are written across the §5.1 saga.
-            "forked_from_session_id",
-            "fork_after_seq",
-            "fork_needs_replay",
-            "fork_metadata",
-            "fork_revert_record",
-            "fork_status",
-        }
-        # Columns that must be writable to NULL. `fork_metadata` clears after
-        # the fork's first result; `claude_session_id` must be clearable so a
-        # HISTORY_REPLAY fork (Codex) can overwrite the pre-minted resume_id
-        # hint with NULL post-prepare_fork — otherwise a restart before the
-        # first turn reloads the bogus hint and spawns `codex resume <bogus>`
-        # (Vera review BLOCKING #1). Other columns omitted by the caller are
-        # left untouched.
-        nullable = {"fork_metadata", "claude_session_id"}
-        bool_fields = {"archived", "fork_needs_replay"}
         updates: dict[str, Any] = {}
         for k, v in fields.items():
-            if k not in allowed:
+            if k not in _SESSION_UPDATABLE:
                 continue
-            if v is None and k not in nullable:
+            if v is None and k not in _SESSION_NULLABLE:
                 continue
-            updates[k] = int(bool(v)) if k in bool_fields else v
+            updates[k] = int(bool(v)) if k in _SESSION_BOOL_FIELDS else v
         if not updates:
             return
-        set_clause = ", ".join(f"{k} = ?" for k in updates)
-        values = list(updates.values()) + [session_id]
-        await self._conn.execute(
-            f"UPDATE sessions SET {set_clause} WHERE id = ?",
-            values,
-        )
+        if len(updates) == 1:
+            # The common case (one field per call) uses a prebuilt statement.
+            ((k, v),) = updates.items()
+            await self._conn.execute(_UPDATE_SESSION_SQL[k], (v, session_id))
+        else:
+            set_clause = ", ".join(f"{k} = ?" for k in updates)
+            values = list(updates.values()) + [session_id]
+            await self._conn.execute(
+                f"UPDATE sessions SET {set_clause} WHERE id = ?",
+                values,
+            )
         await self._conn.commit()
 
     # --- Agents ---
@@ -147,8 +147,7 @@ async def classify_side_effects(db, parent_id: str, from_seq: int) -> dict[str,
     *invoked*, not whether it's still *running*). Returns a JSON-serializable
     summary the popover renders + the agent-touched path set the revert
     preflight needs."""
-    messages = await db.load_messages(parent_id)
-    rows = [m for m in messages if m["seq"] >= from_seq]
+    rows = [m async for m in db.iter_messages(parent_id, min_seq=from_seq)]
     tool_results = {
         m["tool_use_id"]: m
         for m in rows
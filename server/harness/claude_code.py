@@ -19,6 +19,7 @@ import json
 import logging
 import os
 import re
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -256,57 +257,44 @@ class ClaudeEventParser(EventParser):
 
     def parse(self, obj: dict[str, Any]) -> ParseOutput:
         kind = obj.get("type")
-
-        if kind == "system":
-            if obj.get("subtype") == "init":
-                sid = obj.get("session_id")
-                self._captured_session_id = sid
-                if sid:
-                    return ParseOutput(
-                        events=[HarnessEvent(type="session_started", session_id=sid)]
-                    )
+        # A non-string type (list, dict) is unhashable; treat it as unknown.
+        handler = self._HANDLERS.get(kind) if isinstance(kind, str) else None
+        if handler is None:
+            logger.debug("Unhandled CLI event type: %s", kind)
             return ParseOutput()
+        return handler(self, obj)
+
+    def _system(self, obj: dict[str, Any]) -> ParseOutput:
+        if obj.get("subtype") == "init":
+            sid = obj.get("session_id")
+            self._captured_session_id = sid
+            if sid:
+                return ParseOutput(
+                    events=[HarnessEvent(type="session_started", session_id=sid)]
+                )
+        return ParseOutput()
 
-        # Partial deltas / rate-limit notices / vestigial control protocol —
-        # nothing to surface under the VM0 shape.
-        if kind in ("rate_limit_event", "stream_event", "control_response", "control_request"):
-            return ParseOutput()
+    def _ignore(self, obj: dict[str, Any]) -> ParseOutput:
+        return ParseOutput()
 
-        if kind == "assistant":
-            return ParseOutput(events=self._assistant_blocks(obj.get("message", {})))
+    def _assistant(self, obj: dict[str, Any]) -> ParseOutput:
+        return ParseOutput(events=self._assistant_blocks(obj.get("message", {})))
 
-        if kind == "user":
-            return ParseOutput(events=self._user_blocks(obj.get("message", {})))
+    def _user(self, obj: dict[str, Any]) -> ParseOutput:
+        return ParseOutput(events=self._user_blocks(obj.get("message", {})))
 
-        if kind == "result":
-            return ParseOutput(events=[self._result(obj)], end_of_stream=True)
-
-        logger.debug("Unhandled CLI event type: %s", kind)
-        return ParseOutput()
+    def _end(self, obj: dict[str, Any]) -> ParseOutput:
+        return ParseOutput(events=[self._result(obj)], end_of_stream=True)
 
     def _assistant_blocks(self, message: dict[str, Any]) -> list[HarnessEvent]:
         out: list[HarnessEvent] = []
         for block in message.get("content", []):
-            btype = block.get("type")
-            if btype == "text":
-                text = block.get("text", "")
-                if not text.strip():
-                    continue
-                out.append(HarnessEvent(type="text", content=text, raw=block))
-            elif btype == "thinking":
-                out.append(
-                    HarnessEvent(type="thinking", content=block.get("thinking", ""), raw=block)
-                )
-            elif btype == "tool_use":
-                out.append(
-                    HarnessEvent(
-                        type="tool_use",
-                        tool_name=block.get("name"),
-                        tool_input=block.get("input"),
-                        tool_use_id=block.get("id"),
-                        raw=block,
-                    )
-                )
+            kind = block.get("type")
+            build = _ASSISTANT_BLOCKS.get(kind) if isinstance(kind, str) else None
+            if build is not None:
+                event = build(block)
+                if event is not None:
+                    out.append(event)
         return out
 
     def _user_blocks(self, message: dict[str, Any]) -> list[HarnessEvent]:
@@ -342,6 +330,48 @@ class ClaudeEventParser(EventParser):
             raw=obj,
         )
 
+    # One dict lookup per stream-json line instead of walking an if-chain.
+    # Partial deltas / rate-limit notices / vestigial control protocol have
+    # nothing to surface under the VM0 shape.
+    _HANDLERS: dict[Any, Callable[["ClaudeEventParser", dict[str, Any]], ParseOutput]] = {
+        "system": _system,
+        "assistant": _assistant,
+        "user": _user,
+        "result": _end,
+        "rate_limit_event": _ignore,
+        "stream_event": _ignore,
+        "control_response": _ignore,
+        "control_request": _ignore,
+    }
+
+
+def _text_block(block: dict[str, Any]) -> HarnessEvent | None:
+    text = block.get("text", "")
+    if not text.strip():
+        return None
+    return HarnessEvent(type="text", content=text, raw=block)
+
+
+def _thinking_block(block: dict[str, Any]) -> HarnessEvent:
+    return HarnessEvent(type="thinking", content=block.get("thinking", ""), raw=block)
+
+
+def _tool_use_block(block: dict[str, Any]) -> HarnessEvent:
+    return HarnessEvent(
+        type="tool_use",
+        tool_name=block.get("name"),
+        tool_input=block.get("input"),
+        tool_use_id=block.get("id"),
+        raw=block,
+    )
+
+
+_ASSISTANT_BLOCKS: dict[Any, Callable[[dict[str, Any]], HarnessEvent | None]] = {
+    "text": _text_block,
+    "thinking": _thinking_block,
+    "tool_use": _tool_use_block,
+}
+
 
 # ------------------------------------------------------------------ one-shot
 
@@ -13,7 +13,6 @@ from __future__ import annotations
 
 import asyncio
 import glob
-import json
 import logging
 import os
 import shutil
@@ -23,6 +22,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from . import assembly
 from .events import HarnessCredential, HarnessEvent
 from .profile import RuntimeProfile, TurnContext
@@ -130,10 +131,13 @@ def _terminate_process_group(proc: "asyncio.subprocess.Process", sig: int) -> bo
 
 
 def parse_json_line(line: str) -> dict[str, Any] | None:
-    """Parse a JSONL line, returning None on parse error (logs a warning)."""
+    """Parse a JSONL line, returning None on parse error (logs a warning).
+
+    Every harness event passes through here, so it uses orjson.
+    """
     try:
-        obj = json.loads(line)
-    except json.JSONDecodeError as e:
+        obj = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
         logger.warning("Skipping unparseable harness line: %s — %s", line[:200], e)
         return None
     if not isinstance(obj, dict):
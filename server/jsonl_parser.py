@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
-import json
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
+from itertools import groupby
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
-from .models import MessageContent, MessageRole
+import orjson
+
+from .models import MessageRole
+
+# parse_jsonl_file reads in fixed-size binary chunks rather than materializing
+# the whole transcript — long Claude Code sessions run to hundreds of MB.
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Line types that carry conversation messages; everything else (summaries,
+# file-history snapshots, ...) is ignored. A tuple, not a set: membership
+# compares by equality, so an unhashable "type" is skipped, not a TypeError.
+_MSG_TYPES = ("user", "assistant")
 
 
 @dataclass
@@ -18,83 +31,111 @@ class SessionMetadata:
     timestamp: str | None = None
 
 
+@dataclass(slots=True)
+class ParsedMessage:
+    """One message of a parsed transcript, shaped like MessageContent.
+
+    A slots dataclass rather than the pydantic model: a long transcript
+    parses into hundreds of thousands of these, and they only live until
+    they are turned into an import payload (or a MessageContent) — none
+    of the validation or per-instance __dict__ is needed.
+    """
+
+    role: MessageRole
+    type: str
+    content: Any = None
+    tool_name: str | None = None
+    tool_input: dict[str, Any] | None = None
+    tool_use_id: str | None = None
+    is_error: bool | None = None
+
+    def to_payload(self) -> dict[str, Any]:
+        """The set fields, as a message dict for the import API."""
+        return {k: v for k in self.__slots__ if (v := getattr(self, k)) is not None}
+
+
 @dataclass
 class ParsedSession:
     metadata: SessionMetadata = field(default_factory=SessionMetadata)
-    messages: list[MessageContent] = field(default_factory=list)
+    messages: list[ParsedMessage] = field(default_factory=list)
+
+
+def _user_text(block: dict[str, Any]) -> ParsedMessage:
+    return ParsedMessage(
+        role=MessageRole.user, type="text", content=block.get("text", "")
+    )
+
+
+def _tool_result(block: dict[str, Any]) -> ParsedMessage:
+    get = block.get
+    return ParsedMessage(
+        role=MessageRole.tool,
+        type="tool_result",
+        content=get("content"),
+        tool_use_id=get("tool_use_id"),
+        is_error=get("is_error") or None,
+    )
+
+
+def _assistant_text(block: dict[str, Any]) -> ParsedMessage:
+    return ParsedMessage(
+        role=MessageRole.assistant, type="text", content=block.get("text", "")
+    )
+
+
+def _tool_use(block: dict[str, Any]) -> ParsedMessage:
+    get = block.get
+    return ParsedMessage(
+        role=MessageRole.assistant,
+        type="tool_use",
+        tool_name=get("name"),
+        tool_input=get("input"),
+        tool_use_id=get("id"),
+    )
+
 
+# message role -> content block type -> converter. Block types absent here
+# (thinking, images, ...) are dropped.
+_BLOCK_CONVERTERS: dict[str, dict[str, Callable[[dict[str, Any]], ParsedMessage]]] = {
+    "user": {"text": _user_text, "tool_result": _tool_result},
+    "assistant": {"text": _assistant_text, "tool_use": _tool_use},
+}
 
-def _convert_line(data: dict[str, Any]) -> list[MessageContent] | None:
-    """Convert a single JSONL line to Octopus MessageContent list.
+
+def _convert_line(data: dict[str, Any]) -> list[ParsedMessage] | None:
+    """Convert a single JSONL line to a list of ParsedMessage.
 
     Returns None for lines that should be skipped.
     """
-    line_type = data.get("type")
-    message = data.get("message")
+    get = data.get
+    message = get("message")
 
-    if line_type not in ("user", "assistant") or message is None:
+    if get("type") not in _MSG_TYPES or message is None:
         return None
 
     role_str = message.get("role")
     content = message.get("content")
 
-    if role_str == "user":
-        if isinstance(content, str):
-            return [MessageContent(role=MessageRole.user, type="text", content=content)]
-        if isinstance(content, list):
-            results = []
-            for block in content:
-                if not isinstance(block, dict):
-                    continue
-                block_type = block.get("type")
-                if block_type == "text":
-                    results.append(
-                        MessageContent(
-                            role=MessageRole.user,
-                            type="text",
-                            content=block.get("text", ""),
-                        )
-                    )
-                elif block_type == "tool_result":
-                    results.append(
-                        MessageContent(
-                            role=MessageRole.tool,
-                            type="tool_result",
-                            content=block.get("content"),
-                            tool_use_id=block.get("tool_use_id"),
-                            is_error=block.get("is_error") or None,
-                        )
-                    )
-            return results if results else None
-
-    elif role_str == "assistant":
-        if isinstance(content, list):
-            results = []
-            for block in content:
-                if not isinstance(block, dict):
-                    continue
-                block_type = block.get("type")
-                if block_type == "text":
-                    results.append(
-                        MessageContent(
-                            role=MessageRole.assistant,
-                            type="text",
-                            content=block.get("text", ""),
-                        )
-                    )
-                elif block_type == "tool_use":
-                    results.append(
-                        MessageContent(
-                            role=MessageRole.assistant,
-                            type="tool_use",
-                            tool_name=block.get("name"),
-                            tool_input=block.get("input"),
-                            tool_use_id=block.get("id"),
-                        )
-                    )
-            return results if results else None
-
-    return None
+    if isinstance(content, str):
+        if role_str != "user":
+            return None
+        return [ParsedMessage(role=MessageRole.user, type="text", content=content)]
+
+    # Non-string role or block types would be unhashable lookup keys; they
+    # convert to nothing, as the old == comparisons did.
+    converters = _BLOCK_CONVERTERS.get(role_str) if isinstance(role_str, str) else None
+    if converters is None or not isinstance(content, list):
+        return None
+    converter_for = converters.get
+    results = []
+    for block in content:
+        if not isinstance(block, dict):
+            continue
+        block_type = block.get("type")
+        convert = converter_for(block_type) if isinstance(block_type, str) else None
+        if convert is not None:
+            results.append(convert(block))
+    return results if results else None
 
 
 def _find_primary_session_id(
@@ -106,57 +147,42 @@ def _find_primary_session_id(
     sessions). Use the filename stem as a hint when available; otherwise fall
     back to the session ID with the most messages.
     """
-    from collections import Counter
-
-    counts: Counter[str] = Counter()
-    for data in lines:
-        sid = data.get("sessionId")
-        if sid and data.get("type") in ("user", "assistant"):
-            counts[sid] += 1
-
-    if not counts:
-        return None
-
-    # If the hint matches a known session ID, prefer it
-    if hint and hint in counts:
-        return hint
-
-    # Otherwise pick the session ID with the most messages
-    return counts.most_common(1)[0][0]
+    return _parse_records(lines, session_id_hint=hint).metadata.session_id
 
 
 def _extract_session_metadata(
     lines: list[dict[str, Any]], session_id_hint: str | None = None
 ) -> SessionMetadata:
     """Extract session ID, cwd, and first user message from parsed JSONL lines."""
-    meta = SessionMetadata()
-    meta.session_id = _find_primary_session_id(lines, hint=session_id_hint)
+    return _parse_records(lines, session_id_hint=session_id_hint).metadata
+
+
+def _note_metadata(meta: SessionMetadata, data: dict[str, Any]) -> None:
+    """Fill whichever of cwd / timestamp / first_user_message `meta` still
+    lacks from one message line."""
+    get = data.get
+    if meta.cwd is None:
+        meta.cwd = get("cwd") or None
+    if meta.timestamp is None:
+        meta.timestamp = get("timestamp") or None
+    if meta.first_user_message is None and get("type") == "user":
+        content = (get("message") or {}).get("content")
+        if isinstance(content, str):
+            meta.first_user_message = content[:200]
+        elif isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict) and block.get("type") == "text":
+                    meta.first_user_message = block.get("text", "")[:200]
+                    break
 
-    for data in lines:
-        if data.get("type") not in ("user", "assistant"):
-            continue
-        if meta.session_id and data.get("sessionId") != meta.session_id:
-            continue
-        if meta.cwd is None and data.get("cwd"):
-            meta.cwd = data["cwd"]
-        if meta.timestamp is None and data.get("timestamp"):
-            meta.timestamp = data["timestamp"]
-        if meta.first_user_message is None and data.get("type") == "user":
-            message = data.get("message", {})
-            content = message.get("content")
-            if isinstance(content, str):
-                meta.first_user_message = content[:200]
-            elif isinstance(content, list):
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        meta.first_user_message = block.get("text", "")[:200]
-                        break
-        if all([meta.cwd, meta.first_user_message, meta.timestamp]):
-            break
-    return meta
-
-
-def _consolidate_messages(messages: list[MessageContent]) -> list[MessageContent]:
+
+def _text_run_role(msg: ParsedMessage) -> MessageRole | None:
+    """groupby key for _consolidate_messages: text messages group by role;
+    anything else (None) is never merged."""
+    return msg.role if msg.type == "text" else None
+
+
+def _consolidate_messages(messages: list[ParsedMessage]) -> list[ParsedMessage]:
     """Merge consecutive same-role text blocks and collapse tool call pairs.
 
     Produces a cleaner conversation view:
@@ -168,90 +194,161 @@ def _consolidate_messages(messages: list[MessageContent]) -> list[MessageContent
     if not messages:
         return []
 
-    # First pass: build a lookup of tool_use_id -> tool_result
-    result_by_id: dict[str, MessageContent] = {}
-    for msg in messages:
-        if msg.type == "tool_result" and msg.tool_use_id:
-            result_by_id[msg.tool_use_id] = msg
-
-    consolidated: list[MessageContent] = []
+    # One pass: each tool_use is emitted as a fresh copy and remembered by
+    # id, and a later tool_result writes its preview into that copy.
+    # Id-bearing tool_results are always dropped — folded or orphaned.
+    pending: dict[str, ParsedMessage] = {}
+    folded: list[ParsedMessage] = []
+    append = folded.append
     for msg in messages:
-        # Skip standalone tool_results — they'll be folded into tool_use
-        if msg.type == "tool_result" and msg.tool_use_id in result_by_id:
+        msg_type = msg.type
+        if msg_type == "tool_result" and msg.tool_use_id:
+            tool_use = pending.get(msg.tool_use_id)
+            if tool_use is not None:
+                result_preview = None
+                if msg.content:
+                    preview = str(msg.content)[:200]
+                    if msg.is_error:
+                        result_preview = f"[error] {preview}"
+                    else:
+                        result_preview = preview
+                tool_use.content = result_preview
             continue
 
-        # For tool_use, attach a content summary from its result
-        if msg.type == "tool_use" and msg.tool_use_id:
-            result = result_by_id.get(msg.tool_use_id)
-            result_preview = None
-            if result and result.content:
-                preview = str(result.content)[:200]
-                if result.is_error:
-                    result_preview = f"[error] {preview}"
-                else:
-                    result_preview = preview
-            consolidated.append(MessageContent(
+        if msg_type == "tool_use" and msg.tool_use_id:
+            tool_use = ParsedMessage(
                 role=msg.role,
-                type=msg.type,
-                content=result_preview,
+                type=msg_type,
                 tool_name=msg.tool_name,
                 tool_input=msg.tool_input,
                 tool_use_id=msg.tool_use_id,
-            ))
-            continue
-
-        # Merge consecutive text messages with the same role
-        if (
-            msg.type == "text"
-            and consolidated
-            and consolidated[-1].type == "text"
-            and consolidated[-1].role == msg.role
-        ):
-            prev = consolidated[-1]
-            merged = (prev.content or "") + "\n\n" + (msg.content or "")
-            consolidated[-1] = MessageContent(
-                role=prev.role,
-                type="text",
-                content=merged,
             )
+            pending[msg.tool_use_id] = tool_use
+            append(tool_use)
             continue
 
-        consolidated.append(msg)
+        append(msg)
+
+    # Merge each run of consecutive same-role text messages with a single
+    # join — pairwise concatenation re-copied the growing text on every
+    # merge, quadratic in the length of long streamed replies.
+    consolidated: list[ParsedMessage] = []
+    for role, group in groupby(folded, key=_text_run_role):
+        if role is None:
+            consolidated.extend(group)
+            continue
+        run = list(group)
+        if len(run) == 1:
+            consolidated.append(run[0])
+            continue
+        consolidated.append(ParsedMessage(
+            role=role,
+            type="text",
+            content="\n\n".join(m.content or "" for m in run),
+        ))
 
     return consolidated
 
 
-def parse_jsonl_lines(
-    lines: list[str], session_id_hint: str | None = None
+def _parse_records(
+    records: Iterable[dict[str, Any]], session_id_hint: str | None = None
 ) -> ParsedSession:
-    """Parse JSONL string lines into a ParsedSession."""
-    parsed_data: list[dict[str, Any]] = []
+    """Build a ParsedSession from decoded JSONL records in a single pass.
+
+    Message lines are tallied, converted and buffered per sessionId as they
+    stream by; once the input is exhausted the primary session is picked
+    (hint if present, else the most frequent) and only its buffered
+    messages and metadata are kept.
+    """
+    counts: dict[str, int] = {}
+    meta_by_sid: defaultdict[str | None, SessionMetadata] = defaultdict(SessionMetadata)
+    messages_by_sid: defaultdict[str | None, list[ParsedMessage]] = defaultdict(list)
+    for data in records:
+        get = data.get
+        if get("type") not in _MSG_TYPES:
+            continue
+        sid = get("sessionId") or None
+        if sid:
+            counts[sid] = counts.get(sid, 0) + 1
+        _note_metadata(meta_by_sid[sid], data)
+        converted = _convert_line(data)
+        if converted:
+            messages_by_sid[sid].extend(converted)
+
+    if not counts:
+        # No line carries a sessionId — everything belongs to one session.
+        primary = None
+    elif session_id_hint and session_id_hint in counts:
+        primary = session_id_hint
+    else:
+        # max keeps the first-seen sid on ties, as most_common(1) did.
+        primary = max(counts, key=counts.__getitem__)
+
+    metadata = meta_by_sid.get(primary) or SessionMetadata()
+    metadata.session_id = primary
+    messages = _consolidate_messages(messages_by_sid.get(primary, []))
+    return ParsedSession(metadata=metadata, messages=messages)
+
+
+def _decode_lines(lines: Iterable[str | bytes]) -> Iterator[dict[str, Any]]:
+    """Decode each non-empty line, silently skipping malformed ones.
+
+    orjson takes str or bytes directly, so raw file lines never go through
+    a separate UTF-8 decode.
+    """
     for line in lines:
-        line = line.strip()
         if not line:
             continue
         try:
-            parsed_data.append(json.loads(line))
-        except json.JSONDecodeError:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError:  # also raised for invalid UTF-8
             continue
 
-    metadata = _extract_session_metadata(parsed_data, session_id_hint=session_id_hint)
-    messages: list[MessageContent] = []
-    # Only include messages matching the primary session ID
-    for data in parsed_data:
-        if metadata.session_id and data.get("sessionId") != metadata.session_id:
-            continue
-        converted = _convert_line(data)
-        if converted:
-            messages.extend(converted)
 
-    messages = _consolidate_messages(messages)
-    return ParsedSession(metadata=metadata, messages=messages)
+def parse_jsonl_lines(
+    lines: Iterable[str | bytes], session_id_hint: str | None = None
+) -> ParsedSession:
+    """Parse JSONL lines (str or raw bytes) into a ParsedSession."""
+    return _parse_records(_decode_lines(lines), session_id_hint=session_id_hint)
+
+
+def _iter_binary_lines(f: BinaryIO) -> Iterator[bytearray]:
+    """Yield the newline-delimited lines of a binary file, chunk by chunk.
+
+    Only the trailing partial line is carried between reads, so memory is
+    bounded by the chunk size plus the longest single line.
+    """
+    buf = bytearray()
+    while chunk := f.read(_READ_CHUNK_SIZE):
+        buf += chunk
+        end = buf.rfind(b"\n")
+        if end < 0:
+            continue
+        yield from buf[:end].split(b"\n")
+        del buf[: end + 1]
+    if buf:
+        yield buf
 
 
 def parse_jsonl_file(path: Path | str) -> ParsedSession:
-    """Read a JSONL file and parse it into a ParsedSession."""
+    """Stream a JSONL file from disk and parse it into a ParsedSession.
+
+    Claude Code names transcripts after their session id, so the stem is
+    tried first as a prefilter: a line that doesn't contain those bytes
+    can't belong to that session and is skipped without being decoded
+    (resumed sessions can leave a lot of stray lines behind). If no
+    message line carries the stem's id, the file is parsed in full and
+    the most frequent session wins as usual.
+    """
     path = Path(path)
-    with path.open("r", encoding="utf-8") as f:
-        lines = f.readlines()
-    return parse_jsonl_lines(lines, session_id_hint=path.stem)
+    hint = path.stem
+    needle = hint.encode()
+    with path.open("rb") as f:
+        parsed = parse_jsonl_lines(
+            (line for line in _iter_binary_lines(f) if needle in line),
+            session_id_hint=hint,
+        )
+    if parsed.metadata.session_id == hint:
+        return parsed
+    with path.open("rb") as f:
+        return parse_jsonl_lines(_iter_binary_lines(f), session_id_hint=hint)
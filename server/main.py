@@ -10,6 +10,7 @@ os.environ.pop("CLAUDECODE", None)
 import uvicorn
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from .auth import verify_token
@@ -37,7 +38,11 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    db = Database(settings.db_path)
+    db = Database(
+        settings.db_path,
+        synchronous=settings.sqlite_synchronous,
+        mmap_size=settings.sqlite_mmap_size,
+    )
     await db.initialize()
     await session_manager.initialize(db)
 
@@ -135,6 +140,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Session detail / import responses are large, highly repetitive JSON.
+# zlib's default level gets nearly all of level 9's ratio at a fraction
+# of the CPU; WebSocket traffic is untouched (http scope only).
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
 
 app.include_router(agents.router)
 app.include_router(sessions.router)
@@ -183,6 +192,9 @@ if _dist_dir.is_dir():
 
 
 def run():
+    # loop/http are left at "auto": uvicorn[standard] ships uvloop and
+    # httptools, which auto selects wherever they're installable (not
+    # Windows), falling back to asyncio/h11 instead of failing.
     uvicorn.run(
         "server.main:app",
         host=settings.host,
@@ -27,8 +27,7 @@ from ..attachments import (
     get_path_with_fork_fallback,
     save_upload,
 )
-from ..auth import verify_token
-from ..config import settings
+from ..auth import token_matches, verify_token
 from ..models import AttachmentMetadata
 from ..session_manager import session_manager
 
@@ -98,9 +97,9 @@ def _verify_download_token(
     auth_header = request.headers.get("authorization", "")
     if auth_header.lower().startswith("bearer "):
         candidate = auth_header.split(" ", 1)[1].strip()
-        if candidate == settings.auth_token:
+        if token_matches(candidate):
             return candidate
-    if token and token == settings.auth_token:
+    if token and token_matches(token):
         return token
     raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
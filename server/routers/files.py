@@ -20,7 +20,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import FileResponse, JSONResponse
 
-from ..config import settings
+from ..auth import token_matches
 
 logger = logging.getLogger(__name__)
 from ..file_viewer import (
@@ -45,9 +45,9 @@ def _verify_token(
     auth_header = request.headers.get("authorization", "")
     if auth_header.lower().startswith("bearer "):
         candidate = auth_header.split(" ", 1)[1].strip()
-        if candidate == settings.auth_token:
+        if token_matches(candidate):
             return candidate
-    if token and token == settings.auth_token:
+    if token and token_matches(token):
         return token
     raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from pydantic_core import PydanticUndefined
 
 from ..auth import verify_token
 from ..harness import BackendForkNotSupported
-from ..models import CreateSessionRequest, DuplicateSessionRequest, ForkSessionRequest, ImportSessionRequest, MessageContent, PendingQuestionInfo, SessionDetail, SessionInfo, SessionStatus
+from ..models import AttachmentMetadata, CreateSessionRequest, DuplicateSessionRequest, ForkSessionRequest, ImportSessionRequest, MessageContent, PendingQuestionInfo, SessionDetail, SessionInfo, SessionStatus
 from ..session_manager import ForkError, fork_info_fields, session_manager
 
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
@@ -41,6 +44,74 @@ def _to_session_info(
     )
 
 
+# MessageContent's wire fields and their model defaults (PydanticUndefined
+# for required ones); load_messages rows also carry DB-only columns
+# (git_head, ...) that must not leak into the response.
+_MESSAGE_FIELDS = tuple(
+    (name, field.get_default(call_default_factory=True))
+    for name, field in MessageContent.model_fields.items()
+)
+_ATTACHMENTS = TypeAdapter(list[AttachmentMetadata])
+
+
+def _message_json(m: dict) -> dict:
+    """One load_messages row in MessageContent's wire shape. Fields an
+    older row lacks get the model default; attachments (rare, and stored
+    as free-form JSON) still go through AttachmentMetadata so they are
+    validated and trimmed to the declared fields."""
+    body = {
+        k: m[k] if default is PydanticUndefined else m.get(k, default)
+        for k, default in _MESSAGE_FIELDS
+    }
+    if body["attachments"]:
+        body["attachments"] = _ATTACHMENTS.dump_python(
+            _ATTACHMENTS.validate_python(body["attachments"]), mode="json"
+        )
+    return body
+
+
+async def _live_detail_response(s, status_code: int = status.HTTP_200_OK) -> Response:
+    """SessionDetail for a live session, pre-encoded as JSON.
+
+    The message history comes from our own DB rows, so it skips pydantic
+    entirely: validating thousands of MessageContent models (and then
+    FastAPI re-validating them against response_model) dominated the
+    cost of opening a long session. The envelope still goes through
+    SessionDetail so its shape matches the declared response_model.
+    """
+    messages_raw = await session_manager.db.load_messages(s.id)
+    detail = SessionDetail(
+        id=s.id,
+        name=s.name,
+        working_dir=s.working_dir,
+        status=s.status,
+        created_at=s.created_at,
+        message_count=s._message_count,
+        claude_session_id=s.claude_session_id,
+        credential_id=s.credential_id,
+        agent_id=s.agent_id,
+        origin=s.origin,
+        backend=s.backend,
+        parent_session_id=s.parent_session_id,
+        delegation_request=s.delegation_request,
+        **_fork_fields(s),
+        pending_queue=[qp.prompt for qp in s._pending_queue],
+        pending_questions=[
+            PendingQuestionInfo(question_id=q.question_id, questions=q.questions)
+            for q in s._pending_questions.values()
+        ],
+        # High-water mark: clients use this as the dedup baseline so any
+        # WS event with seq < next_message_seq is treated as already
+        # applied (it's in the messages list below).
+        next_message_seq=s._message_count,
+    )
+    body = detail.model_dump(mode="json")
+    body["messages"] = [_message_json(m) for m in messages_raw]
+    return Response(
+        orjson.dumps(body), status_code=status_code, media_type="application/json"
+    )
+
+
 @router.get("", response_model=list[SessionInfo])
 async def list_sessions(
     include_archived: bool = Query(False),
@@ -119,34 +190,7 @@ async def import_session(
         agent_id=agent_id,
         backend=req.backend.value,
     )
-    messages_raw = await session_manager.db.load_messages(s.id)
-    messages = [MessageContent(**m) for m in messages_raw]
-    return SessionDetail(
-        id=s.id,
-        name=s.name,
-        working_dir=s.working_dir,
-        status=s.status,
-        created_at=s.created_at,
-        message_count=s._message_count,
-        claude_session_id=s.claude_session_id,
-        credential_id=s.credential_id,
-        agent_id=s.agent_id,
-        origin=s.origin,
-        backend=s.backend,
-        parent_session_id=s.parent_session_id,
-        delegation_request=s.delegation_request,
-        **_fork_fields(s),
-        messages=messages,
-        pending_queue=[qp.prompt for qp in s._pending_queue],
-        pending_questions=[
-            PendingQuestionInfo(question_id=q.question_id, questions=q.questions)
-            for q in s._pending_questions.values()
-        ],
-        # High-water mark: clients use this as the dedup baseline so any
-        # WS event with seq < next_message_seq is treated as already
-        # applied (it's in the messages list above).
-        next_message_seq=s._message_count,
-    )
+    return await _live_detail_response(s, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{session_id}", response_model=SessionDetail)
@@ -155,34 +199,7 @@ async def get_session(session_id: str, _: str = Depends(verify_token)):
     # pending queue / pending questions / live status).
     s = session_manager.get_session(session_id)
     if s is not None:
-        messages_raw = await session_manager.db.load_messages(s.id)
-        messages = [MessageContent(**m) for m in messages_raw]
-        return SessionDetail(
-            id=s.id,
-            name=s.name,
-            working_dir=s.working_dir,
-            status=s.status,
-            created_at=s.created_at,
-            message_count=s._message_count,
-            claude_session_id=s.claude_session_id,
-            credential_id=s.credential_id,
-            agent_id=s.agent_id,
-            origin=s.origin,
-            backend=s.backend,
-            parent_session_id=s.parent_session_id,
-            delegation_request=s.delegation_request,
-            **_fork_fields(s),
-            messages=messages,
-            pending_queue=[qp.prompt for qp in s._pending_queue],
-            pending_questions=[
-                PendingQuestionInfo(question_id=q.question_id, questions=q.questions)
-                for q in s._pending_questions.values()
-            ],
-            # High-water mark: clients use this as the dedup baseline so any
-            # WS event with seq < next_message_seq is treated as already
-            # applied (it's in the messages list above).
-            next_message_seq=s._message_count,
-        )
+        return await _live_detail_response(s)
 
     # Archived session: not in memory; read history straight from DB.
     archived_detail = await session_manager.load_archived_session_detail(session_id)
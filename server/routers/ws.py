@@ -1,19 +1,181 @@
-import json
+import asyncio
+import contextlib
 import logging
 import uuid
+from collections.abc import Awaitable, Callable
 
+import orjson
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
-from ..config import settings
+from ..auth import token_matches
 from ..session_manager import session_manager
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Outbound frames buffered per connection. A client this far behind is
+# disconnected rather than fed a gapped stream: on reconnect the web
+# client refetches session state, which is the correct resync path.
+_OUTBOX_SIZE = 1024
+
+
+def _encode(msg: dict) -> str:
+    """Serialize an outbound frame. orjson instead of send_json's stdlib
+    encoder; frames stay text because the web client JSON.parses them."""
+    return orjson.dumps(msg, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+async def _drain_outbox(
+    ws: WebSocket,
+    outbox: asyncio.Queue[str | None],
+    conn_id: str,
+    *,
+    batch: bool = False,
+) -> None:
+    """Sole writer for a connection: send queued (already encoded) frames
+    in order. A None sentinel means the client overflowed its outbox —
+    close it. However the writer stops, the connection's broadcast sink is
+    dropped at once, so events stop queueing for a dead peer while the
+    receive loop catches up; on an unexpected error the socket is closed
+    too, which ends that loop.
+
+    With `batch` (clients that connect with ?batch=1), events that piled up
+    while the previous send was in flight go out together as one
+    {"type": "batch", "events": [...]} frame, so a burst costs one WebSocket
+    write instead of one per event. Other clients predate that frame type
+    and get every event as its own frame.
+    """
+    close: tuple[int, str] | None = (1011, "Internal error")
+    try:
+        while (frame := await outbox.get()) is not None:
+            if not batch or outbox.empty():
+                await ws.send_text(frame)
+                continue
+            events = [frame]
+            while not outbox.empty() and (frame := outbox.get_nowait()) is not None:
+                events.append(frame)
+            await ws.send_text('{"type":"batch","events":[' + ",".join(events) + "]}")
+            if frame is None:
+                break
+        logger.warning("WebSocket client too slow; closing for resync")
+        close = (1013, "Client too slow")
+    except (WebSocketDisconnect, RuntimeError):
+        # Socket already gone (send after close raises RuntimeError); the
+        # receive loop sees the disconnect and finishes cleanup.
+        close = None
+    except Exception:
+        logger.exception("WebSocket writer failed; closing connection")
+    finally:
+        session_manager.remove_broadcast(conn_id)
+    if close is not None:
+        with contextlib.suppress(WebSocketDisconnect, RuntimeError):
+            await ws.close(code=close[0], reason=close[1])
+
+
+def _enqueue(outbox: asyncio.Queue[str | None], conn_id: str, frame: str) -> None:
+    """Queue an encoded frame without waiting on the socket. On overflow the
+    connection's broadcast sink is dropped and the backlog replaced by the
+    None sentinel, so the writer closes the socket instead of sending a
+    gapped stream."""
+    try:
+        outbox.put_nowait(frame)
+    except asyncio.QueueFull:
+        session_manager.remove_broadcast(conn_id)
+        while not outbox.empty():
+            outbox.get_nowait()
+        outbox.put_nowait(None)
+
+
+# Error replies with no per-request fields; _encode never mutates them.
+_INVALID_JSON = {"type": "error", "message": "Invalid JSON"}
+_SEND_MESSAGE_REQUIRED = {"type": "error", "message": "session_id and content required"}
+
+
+# Queues a reply frame on the connection's outbox.
+_Send = Callable[[dict], None]
+
+
+def _error(session_id: str, message: str) -> dict:
+    return {"type": "error", "session_id": session_id, "message": message}
+
+
+async def _on_send_message(data: dict, send: _Send) -> None:
+    get = data.get
+    session_id = get("session_id")
+    content = get("content", "")
+    raw_aids = get("attachment_ids") or []
+    attachment_ids = (
+        [a for a in raw_aids if isinstance(a, str)]
+        if isinstance(raw_aids, list)
+        else []
+    )
+    # Allow attachment-only turns (no text), but require *some*
+    # signal so we don't kick a backend turn off an empty payload.
+    if not session_id or (not content and not attachment_ids):
+        send(_SEND_MESSAGE_REQUIRED)
+        return
+
+    try:
+        await session_manager.start_message(
+            session_id, content, attachment_ids=attachment_ids
+        )
+    except ValueError as e:
+        send(_error(session_id, str(e)))
+
+
+async def _on_interrupt(data: dict, send: _Send) -> None:
+    session_id = data.get("session_id")
+    if session_id:
+        await session_manager.interrupt(session_id)
+
+
+async def _on_approve_tool(data: dict, send: _Send) -> None:
+    get = data.get
+    session_id = get("session_id")
+    tool_use_id = get("tool_use_id")
+    if session_id and tool_use_id:
+        if not await session_manager.approve_tool(session_id, tool_use_id):
+            send(_error(session_id, "No pending approval found"))
+
+
+async def _on_deny_tool(data: dict, send: _Send) -> None:
+    get = data.get
+    session_id = get("session_id")
+    tool_use_id = get("tool_use_id")
+    if session_id and tool_use_id:
+        ok = await session_manager.deny_tool(
+            session_id, tool_use_id, get("reason", "")
+        )
+        if not ok:
+            send(_error(session_id, "No pending approval found"))
+
+
+async def _on_answer_question(data: dict, send: _Send) -> None:
+    get = data.get
+    session_id = get("session_id")
+    question_id = get("question_id")
+    answers = get("answers")
+    if session_id and question_id and isinstance(answers, list):
+        ok = await session_manager.answer_question(session_id, question_id, answers)
+        if not ok:
+            send(_error(session_id, "No pending question found"))
+
+
+# Client message type -> handler(data, send).
+_HANDLERS: dict[str, Callable[[dict, _Send], Awaitable[None]]] = {
+    "send_message": _on_send_message,
+    "interrupt": _on_interrupt,
+    "approve_tool": _on_approve_tool,
+    "deny_tool": _on_deny_tool,
+    "answer_question": _on_answer_question,
+}
+
 
 @router.websocket("/ws")
-async def websocket_endpoint(ws: WebSocket, token: str = Query(...)):
-    if token != settings.auth_token:
+async def websocket_endpoint(
+    ws: WebSocket, token: str = Query(...), batch: bool = Query(False)
+):
+    if not token_matches(token):
         await ws.close(code=4001, reason="Unauthorized")
         return
 
@@ -21,107 +183,34 @@ async def websocket_endpoint(ws: WebSocket, token: str = Query(...)):
     logger.info("WebSocket client connected")
 
     conn_id = uuid.uuid4().hex
+    outbox: asyncio.Queue[str | None] = asyncio.Queue(maxsize=_OUTBOX_SIZE)
+    writer = asyncio.create_task(_drain_outbox(ws, outbox, conn_id, batch=batch))
+
+    def send_frame(frame: str) -> None:
+        """Broadcasts and replies both come through here so frames keep
+        their order."""
+        _enqueue(outbox, conn_id, frame)
 
-    async def broadcast(msg: dict):
-        try:
-            await ws.send_json(msg)
-        except Exception:
-            pass
+    def send(msg: dict) -> None:
+        send_frame(_encode(msg))
 
-    session_manager.on_broadcast(conn_id, broadcast)
+    session_manager.on_broadcast_frame(conn_id, send_frame)
 
     try:
         while True:
             raw = await ws.receive_text()
             try:
-                data = json.loads(raw)
-            except json.JSONDecodeError:
-                await ws.send_json({"type": "error", "message": "Invalid JSON"})
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                send(_INVALID_JSON)
                 continue
 
             msg_type = data.get("type")
-
-            if msg_type == "send_message":
-                session_id = data.get("session_id")
-                content = data.get("content", "")
-                raw_aids = data.get("attachment_ids") or []
-                attachment_ids = (
-                    [a for a in raw_aids if isinstance(a, str)]
-                    if isinstance(raw_aids, list)
-                    else []
-                )
-                # Allow attachment-only turns (no text), but require *some*
-                # signal so we don't kick a backend turn off an empty payload.
-                if not session_id or (not content and not attachment_ids):
-                    await ws.send_json(
-                        {"type": "error", "message": "session_id and content required"}
-                    )
-                    continue
-
-                try:
-                    await session_manager.start_message(
-                        session_id, content, attachment_ids=attachment_ids
-                    )
-                except ValueError as e:
-                    await ws.send_json(
-                        {"type": "error", "session_id": session_id, "message": str(e)}
-                    )
-
-            elif msg_type == "interrupt":
-                session_id = data.get("session_id")
-                if session_id:
-                    await session_manager.interrupt(session_id)
-
-            elif msg_type == "approve_tool":
-                session_id = data.get("session_id")
-                tool_use_id = data.get("tool_use_id")
-                if session_id and tool_use_id:
-                    ok = await session_manager.approve_tool(session_id, tool_use_id)
-                    if not ok:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "session_id": session_id,
-                                "message": "No pending approval found",
-                            }
-                        )
-
-            elif msg_type == "deny_tool":
-                session_id = data.get("session_id")
-                tool_use_id = data.get("tool_use_id")
-                reason = data.get("reason", "")
-                if session_id and tool_use_id:
-                    ok = await session_manager.deny_tool(
-                        session_id, tool_use_id, reason
-                    )
-                    if not ok:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "session_id": session_id,
-                                "message": "No pending approval found",
-                            }
-                        )
-
-            elif msg_type == "answer_question":
-                session_id = data.get("session_id")
-                question_id = data.get("question_id")
-                answers = data.get("answers")
-                if session_id and question_id and isinstance(answers, list):
-                    ok = await session_manager.answer_question(
-                        session_id, question_id, answers
-                    )
-                    if not ok:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "session_id": session_id,
-                                "message": "No pending question found",
-                            }
-                        )
-
-            else:
+            handler = _HANDLERS.get(msg_type) if isinstance(msg_type, str) else None
+            if handler is None:
                 logger.debug("Ignoring unknown client message type: %s", msg_type)
+            else:
+                await handler(data, send)
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
@@ -129,3 +218,4 @@ async def websocket_endpoint(ws: WebSocket, token: str = Query(...)):
         logger.exception("WebSocket error")
     finally:
         session_manager.remove_broadcast(conn_id)
+        writer.cancel()
@@ -12,6 +12,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, AsyncIterator, Callable
 
+import orjson
+
 from .attachments import (
     MAX_ATTACHMENTS_PER_MESSAGE,
     AttachmentError,
@@ -139,7 +141,7 @@ def fork_info_fields(
     }
 
 
-@dataclass
+@dataclass(slots=True)
 class QueuedPrompt:
     """A user turn waiting to run.
 
@@ -154,7 +156,7 @@ class QueuedPrompt:
     attachment_ids: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingApproval:
     """Held for legacy WS approve_tool/deny_tool messages.
 
@@ -170,7 +172,7 @@ class PendingApproval:
     future: asyncio.Future
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingQuestion:
     """Mirror of an AskUserQuestion the backend is currently asking us.
 
@@ -182,7 +184,7 @@ class PendingQuestion:
     questions: list[dict[str, Any]]
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     id: str
     name: str
@@ -221,6 +223,8 @@ class Session:
     fork_revert_record: str | None = None
     fork_status: str | None = None
     _message_count: int = field(default=0, repr=False)
+    # Last status pushed to listeners; _set_status drops repeats of it.
+    _broadcast_status: SessionStatus | None = field(default=None, repr=False)
     # Set True for the lifetime of a fork-create saga against this session as
     # the PARENT (session-rewind.md §5.4). start_message() refuses while
     # set; cleared in fork_session's finally. A real mutex even though
@@ -255,6 +259,8 @@ class SessionManager:
     def __init__(self) -> None:
         self.sessions: dict[str, Session] = {}
         self._broadcast_callbacks: dict[str, Callable] = {}
+        # WebSocket connections: see on_broadcast_frame.
+        self._frame_sinks: dict[str, Callable[[str], None]] = {}
         self.db: Database | None = None
         # Wired in by main.py once the manager is constructed. Kept as
         # an opaque object — we only call `.fire(event)` on it — so the
@@ -275,6 +281,7 @@ class SessionManager:
     async def initialize(self, db: Database) -> None:
         self.db = db
         rows = await db.load_sessions()
+        counts = await db.count_messages_by_session()
         for row in rows:
             session = Session(
                 id=row["id"],
@@ -290,7 +297,7 @@ class SessionManager:
                 delegation_request=row.get("delegation_request"),
                 **_session_fork_kwargs(row),
             )
-            session._message_count = await db.count_messages(session.id)
+            session._message_count = counts.get(session.id, 0)
             self.sessions[session.id] = session
         logger.info("Loaded %d sessions from database", len(rows))
         # Sweep forks left mid-saga by a crash (session-rewind.md §5.6.7).
@@ -301,15 +308,52 @@ class SessionManager:
     def on_broadcast(self, key: str, callback: Callable) -> None:
         self._broadcast_callbacks[key] = callback
 
+    def on_broadcast_frame(self, key: str, sink: Callable[[str], None]) -> None:
+        """Register a synchronous sink for broadcasts as JSON text.
+
+        Each broadcast is encoded once however many sinks are attached, and
+        delivered without a task or await per sink — a sink only queues the
+        frame (ws.py hands it to the connection's writer task).
+        """
+        self._frame_sinks[key] = sink
+
     def remove_broadcast(self, key: str) -> None:
         self._broadcast_callbacks.pop(key, None)
+        self._frame_sinks.pop(key, None)
 
     async def _broadcast(self, message: dict) -> None:
-        for cb in list(self._broadcast_callbacks.values()):
+        sinks = tuple(self._frame_sinks.values())
+        if sinks:
             try:
-                await cb(message)
+                frame = orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+            except TypeError:
+                logger.exception("Broadcast encode error")
+                sinks = ()
+            for sink in sinks:
+                try:
+                    sink(frame)
+                except Exception:
+                    logger.exception("Broadcast callback error")
+
+        # Listeners run concurrently, so one slow listener delays a
+        # broadcast by its own time, not everyone else's as well.
+        # Per-listener ordering holds: the next broadcast starts only after
+        # every listener has finished this one.
+        callbacks = tuple(self._broadcast_callbacks.values())
+        if not callbacks:
+            return
+        if len(callbacks) == 1:
+            try:
+                await callbacks[0](message)
             except Exception:
                 logger.exception("Broadcast callback error")
+            return
+        results = await asyncio.gather(
+            *(cb(message) for cb in callbacks), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Broadcast callback error", exc_info=result)
 
     def list_sessions(self) -> list[Session]:
         return list(self.sessions.values())
@@ -628,7 +672,7 @@ class SessionManager:
             # 6. prepare_fork (external state) with explicit compensation.
             try:
                 artifact = await harness.prepare_fork(
-                    [MessageContent(**m) for m in copied],
+                    [MessageContent.model_validate(m) for m in copied],
                     parent.working_dir,
                     resume_id_hint,
                     fork_id,
@@ -1145,11 +1189,18 @@ class SessionManager:
                 origin=session.origin,
                 backend=session.backend,
             )
-        if messages:
-            for msg in messages:
-                await self._persist_message(session, msg)
-            if self.db:
-                await self.db.flush()
+        if messages and self.db:
+            # One executemany + one commit for the whole transcript rather
+            # than a round-trip per message.
+            start = session._message_count
+            await self.db.append_messages(
+                session.id,
+                [
+                    {"seq": start + i, **_message_db_fields(msg)}
+                    for i, msg in enumerate(messages)
+                ],
+            )
+            session._message_count = start + len(messages)
         return session
 
     async def archive_session(self, session_id: str) -> Session:
@@ -1331,11 +1382,12 @@ class SessionManager:
         if self.db is None:
             return []
         rows = await self.db.load_sessions(include_archived=True)
+        counts = await self.db.count_messages_by_session()
         out: list[dict[str, Any]] = []
         for row in rows:
             if not row["archived"]:
                 continue
-            count = await self.db.count_messages(row["id"])
+            count = counts.get(row["id"], 0)
             out.append(
                 {
                     "id": row["id"],
@@ -1371,14 +1423,11 @@ class SessionManager:
         """
         if self.db is None:
             return None
-        rows = await self.db.load_sessions(include_archived=True)
-        match = next(
-            (r for r in rows if r["id"] == session_id and r["archived"]), None
-        )
-        if match is None:
+        match = await self.db.load_session(session_id)
+        if match is None or not match["archived"]:
             return None
         messages_raw = await self.db.load_messages(session_id)
-        messages = [MessageContent(**m) for m in messages_raw]
+        messages = [MessageContent.model_validate(m) for m in messages_raw]
         return SessionDetail(
             id=match["id"],
             name=match["name"],
@@ -1414,11 +1463,8 @@ class SessionManager:
         """
         if self.db is None:
             raise ValueError("DB not initialized")
-        rows = await self.db.load_sessions(include_archived=True)
-        match = next(
-            (r for r in rows if r["id"] == session_id and r["archived"]), None
-        )
-        if match is None:
+        match = await self.db.load_session(session_id)
+        if match is None or not match["archived"]:
             raise ValueError(f"Archived session {session_id} not found")
         await self.db.update_session_field(session_id, archived=False)
         # Reload into the in-memory map so writes (sendMessage etc.)
@@ -1582,16 +1628,7 @@ class SessionManager:
         await self.db.append_message(
             session_id=session.id,
             seq=seq,
-            role=msg.role.value,
-            type=msg.type,
-            content=msg.content,
-            tool_name=msg.tool_name,
-            tool_input=msg.tool_input,
-            tool_use_id=msg.tool_use_id,
-            is_error=msg.is_error,
-            session_id_ref=msg.session_id,
-            cost=msg.cost,
-            attachments=[a.model_dump() for a in msg.attachments] if msg.attachments else None,
+            **_message_db_fields(msg),
             git_head=git_head,
             git_status_clean=git_status_clean,
         )
@@ -1864,10 +1901,7 @@ class SessionManager:
             await self._broadcast(event)
             yield event
 
-            session.status = SessionStatus.running
-            await self._broadcast(
-                {"type": "status", "session_id": session_id, "status": "running"}
-            )
+            await self._set_status(session, SessionStatus.running)
 
             # Attachments wrap the raw prompt; the `/showme` viewer flow now
             # resolves on the client + dedicated resolution endpoint instead of
@@ -1889,9 +1923,8 @@ class SessionManager:
                     else -1
                 )
                 copied = [
-                    MessageContent(**m)
-                    for m in await self.db.load_messages(session.id)
-                    if m["seq"] <= cutoff
+                    MessageContent.model_validate(m)
+                    async for m in self.db.iter_messages(session.id, max_seq=cutoff)
                 ]
                 augmented_prompt = fork_helpers.wrap_for_fork_replay(
                     augmented_prompt, copied
@@ -1926,12 +1959,11 @@ class SessionManager:
                 await self._broadcast(event)
                 yield event
             finally:
-                if self.db:
-                    await self.db.flush()
-                session.status = SessionStatus.idle
-                await self._broadcast(
-                    {"type": "status", "session_id": session_id, "status": "idle"}
-                )
+                try:
+                    if self.db:
+                        await self.db.flush()
+                finally:
+                    await self._set_status(session, SessionStatus.idle)
         finally:
             session._lock.release()
 
@@ -1971,10 +2003,7 @@ class SessionManager:
                 session._lock.release()
             except RuntimeError:
                 pass
-            session.status = SessionStatus.idle
-            await self._broadcast(
-                {"type": "status", "session_id": session_id, "status": "idle"}
-            )
+            await self._set_status(session, SessionStatus.idle)
         else:
             # Truly idle — nothing to interrupt.
             return False
@@ -1998,6 +2027,21 @@ class SessionManager:
         await self._broadcast(event)
         return True
 
+    async def _set_status(self, session: Session, status: SessionStatus) -> None:
+        """Set `session.status` and tell listeners, but only on an edge.
+
+        Interrupting or resetting an already-idle session used to fan out
+        an identical `idle` frame to every listener; clients already hold
+        that state, so repeats are dropped.
+        """
+        session.status = status
+        if session._broadcast_status is status:
+            return
+        session._broadcast_status = status
+        await self._broadcast(
+            {"type": "status", "session_id": session.id, "status": status.value}
+        )
+
     async def _safe_backend_interrupt(self, backend: HarnessRun) -> None:
         """Best-effort background teardown of a wedged backend subprocess.
 
@@ -2028,13 +2072,10 @@ class SessionManager:
             session._backend = None
         if session._lock.locked():
             session._lock.release()
-        session.status = SessionStatus.idle
         session._pending_approvals.clear()
         session._pending_questions.clear()
         self._cancel_all_question_timers(session)
-        await self._broadcast(
-            {"type": "status", "session_id": session_id, "status": "idle"}
-        )
+        await self._set_status(session, SessionStatus.idle)
 
     # ------------------------------------------------------------------ backend run loop
 
@@ -3248,6 +3289,25 @@ class SessionManager:
         return True
 
 
+def _message_db_fields(msg: MessageContent) -> dict[str, Any]:
+    """The `Database.append_message` columns carried by a MessageContent
+    (everything except session_id / seq and the per-turn git anchor)."""
+    return {
+        "role": msg.role.value,
+        "type": msg.type,
+        "content": msg.content,
+        "tool_name": msg.tool_name,
+        "tool_input": msg.tool_input,
+        "tool_use_id": msg.tool_use_id,
+        "is_error": msg.is_error,
+        "session_id_ref": msg.session_id,
+        "cost": msg.cost,
+        "attachments": (
+            [a.model_dump() for a in msg.attachments] if msg.attachments else None
+        ),
+    }
+
+
 def _guess_mime(filename: str) -> str:
     """Lightweight MIME guess for replayed attachments.
 
@@ -5,6 +5,7 @@ from httpx import ASGITransport, AsyncClient
 
 from server.database import Database
 from server.main import app
+from server.models import MessageContent
 from server.session_manager import session_manager
 
 TOKEN = "changeme"
@@ -89,6 +90,79 @@ async def test_get_session(client):
     assert "messages" in data
 
 
+@pytest.mark.asyncio
+async def test_get_session_messages_match_wire_model(client):
+    create_resp = await client.post(
+        "/api/sessions", headers=HEADERS, json={"name": "History"}
+    )
+    sid = create_resp.json()["id"]
+    await session_manager.db.append_message(
+        sid, seq=0, role="user", type="text", content="hi",
+        attachments=[{"id": "a1", "filename": "x.png", "size": 3, "mime_type": "image/png"}],
+        git_head="abc123",
+    )
+
+    resp = await client.get(f"/api/sessions/{sid}", headers=HEADERS)
+    assert resp.status_code == 200
+    (msg,) = resp.json()["messages"]
+    # Same keys/values as serializing the pydantic model; DB-only columns
+    # (git_head, ...) stay server-side.
+    expected = MessageContent(
+        role="user", type="text", content="hi", seq=0,
+        attachments=[{"id": "a1", "filename": "x.png", "size": 3, "mime_type": "image/png"}],
+    ).model_dump(mode="json")
+    assert msg == expected
+
+
+@pytest.mark.asyncio
+async def test_get_session_fills_legacy_message_rows(client, monkeypatch):
+    create_resp = await client.post(
+        "/api/sessions", headers=HEADERS, json={"name": "Legacy"}
+    )
+    sid = create_resp.json()["id"]
+    # A row from before seq/attachments/cost existed, and an attachment
+    # carrying an undeclared key and a stringly size.
+    rows = [
+        {"role": "user", "type": "text", "content": "old"},
+        {
+            "role": "user", "type": "text", "content": "new", "seq": 1,
+            "attachments": [{"id": "a1", "filename": "x.png", "size": "3",
+                             "mime_type": "image/png", "path": "/srv/x.png"}],
+        },
+    ]
+
+    async def load_messages(session_id):
+        return rows
+
+    monkeypatch.setattr(session_manager.db, "load_messages", load_messages)
+    resp = await client.get(f"/api/sessions/{sid}", headers=HEADERS)
+    assert resp.status_code == 200
+    assert resp.json()["messages"] == [
+        MessageContent(**row).model_dump(mode="json") for row in rows
+    ]
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped(client):
+    create_resp = await client.post(
+        "/api/sessions", headers=HEADERS, json={"name": "Big"}
+    )
+    sid = create_resp.json()["id"]
+    await session_manager.db.append_message(
+        sid, seq=0, role="assistant", type="text", content="lorem ipsum " * 500
+    )
+
+    resp = await client.get(
+        f"/api/sessions/{sid}", headers={**HEADERS, "Accept-Encoding": "gzip"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.json()["messages"][0]["content"].startswith("lorem ipsum")
+
+    small = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
 @pytest.mark.asyncio
 async def test_get_session_not_found(client):
     resp = await client.get("/api/sessions/nonexistent", headers=HEADERS)
@@ -4,12 +4,15 @@ import json
 import tempfile
 from pathlib import Path
 
+import httpx
 import pytest
 
+from server import cli
 from server.cli import (
     build_import_payload,
     build_parser,
     discover_sessions,
+    do_handoff,
     get_project_dir,
     do_pull,
 )
@@ -61,6 +64,77 @@ class TestDiscoverSessions:
         sessions = discover_sessions(tmp_path)
         assert len(sessions) == 1
 
+    def test_preview_found_past_first_read(self, tmp_path):
+        filler = json.dumps({"type": "progress", "data": "x" * 1000})
+        user = json.dumps({
+            "type": "user",
+            "sessionId": "abc",
+            "message": {
+                "role": "user",
+                "content": [{"type": "image"}, {"type": "text", "text": "late"}],
+            },
+        })
+        (tmp_path / "abc.jsonl").write_text("\n".join([filler] * 100 + [user]))
+        assert discover_sessions(tmp_path)[0]["preview"] == "late"
+
+    def test_preview_scan_is_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cli, "_PREVIEW_MAX_BYTES", 4096)
+        filler = json.dumps({"type": "progress", "data": "x" * 1000})
+        user = json.dumps({
+            "type": "user",
+            "sessionId": "abc",
+            "message": {"role": "user", "content": "too deep"},
+        })
+        (tmp_path / "abc.jsonl").write_text("\n".join([filler] * 10 + [user]) + "\n")
+        assert discover_sessions(tmp_path)[0]["preview"] == "(no preview)"
+
+    def test_previews_keep_file_order_when_scanned_in_parallel(self, tmp_path):
+        for i in range(5):
+            (tmp_path / f"s{i}.jsonl").write_text(
+                json.dumps({
+                    "type": "user",
+                    "message": {"role": "user", "content": f"msg {i}"},
+                }) + "\n"
+            )
+        sessions = discover_sessions(tmp_path)
+        assert [s["session_id"] for s in sessions] == [f"s{i}" for i in range(5)]
+        assert [s["preview"] for s in sessions] == [f"msg {i}" for i in range(5)]
+
+    def test_preview_cache_reused_until_file_changes(self, tmp_path, monkeypatch):
+        path = tmp_path / "abc.jsonl"
+        path.write_text(json.dumps({
+            "type": "user",
+            "sessionId": "abc",
+            "message": {"role": "user", "content": "first"},
+        }) + "\n")
+        assert discover_sessions(tmp_path)[0]["preview"] == "first"
+        assert (tmp_path / ".octopus-preview-cache.json").exists()
+
+        reads = []
+        real = cli._get_session_preview
+        monkeypatch.setattr(
+            cli, "_get_session_preview", lambda p: reads.append(p) or real(p)
+        )
+        assert discover_sessions(tmp_path)[0]["preview"] == "first"
+        assert reads == []
+
+        path.write_text(json.dumps({
+            "type": "user",
+            "sessionId": "abc",
+            "message": {"role": "user", "content": "second, longer"},
+        }) + "\n")
+        assert discover_sessions(tmp_path)[0]["preview"] == "second, longer"
+        assert reads == [path]
+
+    def test_corrupt_preview_cache_ignored(self, tmp_path):
+        (tmp_path / ".octopus-preview-cache.json").write_text("{not json")
+        (tmp_path / "abc.jsonl").write_text(json.dumps({
+            "type": "user",
+            "sessionId": "abc",
+            "message": {"role": "user", "content": "hi"},
+        }) + "\n")
+        assert discover_sessions(tmp_path)[0]["preview"] == "hi"
+
 
 class TestBuildImportPayload:
     def test_payload_structure(self, tmp_path):
@@ -205,3 +279,88 @@ class TestDoPull:
         # Verify a JSONL file was written
         jsonl_files = list(tmp_path.glob("*.jsonl"))
         assert len(jsonl_files) == 1
+
+
+class TestDoHandoff:
+    @staticmethod
+    def _write_session(project_dir, sid, text):
+        (project_dir / f"{sid}.jsonl").write_text(
+            json.dumps({
+                "type": "user",
+                "sessionId": sid,
+                "cwd": "/proj",
+                "message": {"role": "user", "content": text},
+            }) + "\n"
+        )
+
+    @staticmethod
+    def _client(requests, status_code=201):
+        def handler(request):
+            requests.append(request)
+            body = json.loads(request.content)
+            return httpx.Response(
+                status_code,
+                json={
+                    "id": f"oct-{len(requests)}",
+                    "name": body["name"],
+                    "message_count": len(body["messages"]),
+                },
+            )
+
+        return httpx.Client(
+            base_url="http://test",
+            headers={"Authorization": "Bearer secret"},
+            transport=httpx.MockTransport(handler),
+        )
+
+    def test_single_session(self, tmp_path, capsys):
+        self._write_session(tmp_path, "abc", "hello")
+        args = build_parser().parse_args([
+            "handoff", "--session-id", "abc", "--project-dir", str(tmp_path),
+            "--name", "Mine",
+        ])
+        requests = []
+        do_handoff(args, client=self._client(requests))
+
+        assert len(requests) == 1
+        assert requests[0].url.path == "/api/sessions/import"
+        assert json.loads(requests[0].content)["name"] == "Mine"
+        assert "Session imported: oct-1" in capsys.readouterr().out
+
+    def test_batch_imports_every_session_over_one_client(self, tmp_path, capsys):
+        self._write_session(tmp_path, "a", "first")
+        self._write_session(tmp_path, "b", "second")
+        args = build_parser().parse_args([
+            "handoff", "--batch", "--project-dir", str(tmp_path),
+        ])
+        requests = []
+        do_handoff(args, client=self._client(requests))
+
+        payloads = [json.loads(r.content) for r in requests]
+        assert [p["claude_session_id"] for p in payloads] == ["a", "b"]
+        out = capsys.readouterr().out
+        assert "oct-1" in out and "oct-2" in out
+
+    def test_batch_conflicts_with_session_id(self):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["handoff", "--batch", "--session-id", "x"])
+
+    def test_batch_rejects_name(self, monkeypatch, capsys):
+        monkeypatch.setattr(
+            "sys.argv", ["octopus", "handoff", "--batch", "--name", "x"]
+        )
+        monkeypatch.setattr(cli, "do_handoff", lambda args: pytest.fail("ran"))
+        with pytest.raises(SystemExit) as exc:
+            cli.main()
+        assert exc.value.code == 2
+        assert "--name: not allowed with argument --batch" in capsys.readouterr().err
+
+    def test_http_error_exits_nonzero(self, tmp_path, capsys):
+        self._write_session(tmp_path, "abc", "hello")
+        args = build_parser().parse_args([
+            "handoff", "--session-id", "abc", "--project-dir", str(tmp_path),
+        ])
+        with pytest.raises(SystemExit) as exc:
+            do_handoff(args, client=self._client([], status_code=401))
+        assert exc.value.code == 1
+        assert "HTTP 401" in capsys.readouterr().err
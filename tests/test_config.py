@@ -34,3 +34,16 @@ def test_settings_from_env(monkeypatch):
     s = Settings()
     assert s.auth_token == "my-secret"
     assert s.port == 9000
+
+
+def test_sqlite_synchronous_is_case_insensitive(monkeypatch):
+    from pydantic import ValidationError
+
+    from server.config import Settings
+
+    monkeypatch.setenv("OCTOPUS_SQLITE_SYNCHRONOUS", "normal")
+    assert Settings().sqlite_synchronous == "NORMAL"
+
+    monkeypatch.setenv("OCTOPUS_SQLITE_SYNCHRONOUS", "fast")
+    with pytest.raises(ValidationError):
+        Settings()
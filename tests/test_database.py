@@ -97,6 +97,42 @@ async def test_append_and_load_messages(db):
     assert messages[2]["content"] == "file contents"
 
 
+@pytest.mark.asyncio
+async def test_append_messages_bulk(db):
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+
+    await db.append_messages(
+        "s1",
+        [
+            {"seq": 0, "role": "user", "type": "text", "content": "hello"},
+            {
+                "seq": 1,
+                "role": "assistant",
+                "type": "tool_use",
+                "tool_name": "Read",
+                "tool_input": {"path": "/tmp/foo"},
+                "tool_use_id": "tu_123",
+            },
+            {
+                "seq": 2,
+                "role": "tool",
+                "type": "tool_result",
+                "content": "file contents",
+                "tool_use_id": "tu_123",
+                "is_error": True,
+            },
+        ],
+    )
+    await db.append_messages("s1", [])
+
+    messages = await db.load_messages("s1")
+    assert [m["seq"] for m in messages] == [0, 1, 2]
+    assert messages[0]["content"] == "hello"
+    assert messages[1]["tool_input"] == {"path": "/tmp/foo"}
+    assert messages[2]["is_error"] is True
+    assert await db.count_messages("s1") == 3
+
+
 @pytest.mark.asyncio
 async def test_update_session_field(db):
     await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
@@ -153,3 +189,159 @@ async def test_message_with_cost_and_session_id(db):
     assert len(messages) == 1
     assert messages[0]["session_id"] == "claude_xyz"
     assert messages[0]["cost"] == pytest.approx(0.05)
+
+
+@pytest.mark.asyncio
+async def test_load_messages_large_history(db, monkeypatch):
+    """Results past the offload threshold decode identically on a worker thread."""
+    monkeypatch.setattr("server.database._DECODE_OFFLOAD_MIN_ROWS", 2)
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    await db.append_messages(
+        "s1",
+        [
+            {"seq": i, "role": "user", "type": "text", "content": f"msg{i}"}
+            for i in range(5)
+        ],
+    )
+
+    messages = await db.load_messages("s1")
+    assert [m["content"] for m in messages] == [f"msg{i}" for i in range(5)]
+    assert messages[0]["attachments"] == []
+    assert messages[0]["is_error"] is None
+
+
+@pytest.mark.asyncio
+async def test_buffered_messages_visible_to_every_reader(db, monkeypatch):
+    monkeypatch.setattr("server.database._PENDING_MESSAGES_MAX", 3)
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    for seq in range(2):
+        await db.append_message("s1", seq=seq, role="user", type="text", content="x")
+    assert await db.count_messages("s1") == 2
+
+    for seq in range(2, 5):
+        await db.append_message("s1", seq=seq, role="user", type="text", content="x")
+    # Crossing the threshold writes the batch without waiting for a flush.
+    assert db._pending_messages == {}
+
+    await db.append_message("s1", seq=5, role="user", type="text", content="x")
+    await db.delete_session("s1")
+    assert await db.load_messages("s1") == []
+
+
+@pytest.mark.asyncio
+async def test_buffered_rows_of_deleted_session_do_not_block_others(db):
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    await db.save_session("s2", "Session 2", "/tmp", "2025-01-01T00:00:00+00:00")
+    await db.append_message("s1", seq=0, role="user", type="text", content="a")
+    await db.append_message("s2", seq=0, role="user", type="text", content="b")
+    await db.delete_session("s1")
+    # A turn still streaming into the deleted session keeps appending.
+    await db.append_message("s1", seq=1, role="user", type="text", content="c")
+    await db.append_message("s2", seq=1, role="user", type="text", content="d")
+
+    await db.flush()
+    assert db._pending_messages == {}
+    assert [m["content"] for m in await db.load_messages("s2")] == ["b", "d"]
+    assert await db.count_messages("s1") == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_buffered_row_keeps_rest_of_batch(db, caplog):
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    for seq in range(5):
+        # type is NOT NULL, so seq 2 is rejected mid-executemany.
+        kind = None if seq == 2 else "text"
+        await db.append_message("s1", seq=seq, role="user", type=kind, content=str(seq))
+
+    await db.flush()
+    messages = await db.load_messages("s1")
+    assert [m["seq"] for m in messages] == [0, 1, 3, 4]
+    assert "Dropped 1 of 5 buffered message(s) for session s1 (seq 2)" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_load_session_by_id(db):
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    await db.update_session_field("s1", archived=True)
+
+    row = await db.load_session("s1")
+    assert row["id"] == "s1"
+    assert row["archived"] is True
+    assert row["origin"] == "user"
+    assert row == (await db.load_sessions(include_archived=True))[0]
+    assert await db.load_session("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_append_messages_writes_buffered_rows_first(db):
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    await db.append_message("s1", seq=0, role="user", type="text", content="live")
+    await db.append_messages(
+        "s1", [{"seq": 1, "role": "assistant", "type": "text", "content": "bulk"}]
+    )
+    assert db._pending_messages == {}
+    messages = await db.load_messages("s1")
+    assert [(m["seq"], m["content"]) for m in messages] == [(0, "live"), (1, "bulk")]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas_configurable(tmp_path):
+    database = Database(
+        str(tmp_path / "t.db"), synchronous="OFF", mmap_size=1024 * 1024
+    )
+    await database.initialize()
+    try:
+        cursor = await database.conn.execute("PRAGMA synchronous")
+        assert (await cursor.fetchone())[0] == 0
+        cursor = await database.conn.execute("PRAGMA mmap_size")
+        assert (await cursor.fetchone())[0] == 1024 * 1024
+    finally:
+        await database.close()
+
+
+@pytest.mark.parametrize("level", ["", "FAST", "NORMAL; DROP TABLE sessions"])
+def test_sqlite_synchronous_rejects_unknown_level(level):
+    with pytest.raises(ValueError, match="synchronous"):
+        Database(":memory:", synchronous=level)
+
+
+def test_sqlite_mmap_size_coerced_to_int():
+    with pytest.raises(ValueError):
+        Database(":memory:", mmap_size="0; DROP TABLE sessions")
+    assert Database(":memory:", synchronous="full", mmap_size="4096")._mmap_size == 4096
+
+
+@pytest.mark.asyncio
+async def test_agent_session_count_uses_index(db):
+    cursor = await db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM sessions "
+        "WHERE agent_id = ? AND archived = 0",
+        ("a1",),
+    )
+    plan = " ".join(row[-1] for row in await cursor.fetchall())
+    assert "idx_sessions_agent" in plan
+
+
+@pytest.mark.asyncio
+async def test_count_messages_by_session(db):
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    await db.save_session("s2", "Session 2", "/tmp", "2025-01-01T00:00:00+00:00")
+    await db.save_session("s3", "Session 3", "/tmp", "2025-01-01T00:00:00+00:00")
+    for seq in range(3):
+        await db.append_message("s1", seq=seq, role="user", type="text", content="x")
+    await db.append_message("s2", seq=0, role="user", type="text", content="x")
+
+    assert await db.count_messages_by_session() == {"s1": 3, "s2": 1}
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_seq_range(db, monkeypatch):
+    monkeypatch.setattr("server.database._ITER_MESSAGES_BATCH", 2)
+    await db.save_session("s1", "Session 1", "/tmp", "2025-01-01T00:00:00+00:00")
+    for seq in range(5):
+        await db.append_message("s1", seq=seq, role="user", type="text", content=f"m{seq}")
+
+    assert [m["seq"] async for m in db.iter_messages("s1")] == [0, 1, 2, 3, 4]
+    assert [m["content"] async for m in db.iter_messages("s1", min_seq=3)] == ["m3", "m4"]
+    assert [m["seq"] async for m in db.iter_messages("s1", min_seq=1, max_seq=2)] == [1, 2]
+    assert [m async for m in db.iter_messages("s1", max_seq=-1)] == []
@@ -145,6 +145,27 @@ def test_parser_ignores_control_and_unknown():
         assert p.parse({"type": kind}).events == []
 
 
+def test_parser_ignores_non_string_types():
+    p = ClaudeEventParser()
+    for kind in (["assistant"], {"a": 1}, None, 3):
+        out = p.parse({"type": kind})
+        assert out.events == [] and out.end_of_stream is False
+
+    out = p.parse(
+        {
+            "type": "assistant",
+            "message": {
+                "content": [
+                    {"type": ["text"], "text": "list"},
+                    {"type": {"text": 1}, "text": "dict"},
+                    {"type": "text", "text": "kept"},
+                ]
+            },
+        }
+    )
+    assert [e.content for e in out.events] == ["kept"]
+
+
 # --------------------------------------------------------------------------- #
 # One-shot
 # --------------------------------------------------------------------------- #
@@ -1,8 +1,6 @@
 """Tests for the JSONL parser that converts Claude Code sessions to Octopus format."""
 
 import json
-import tempfile
-from pathlib import Path
 
 import pytest
 
@@ -89,6 +87,13 @@ class TestConvertLine:
         assert result[0].tool_input == {"file_path": "/foo.py"}
         assert result[0].tool_use_id == "toolu_123"
 
+    def test_payload_omits_unset_fields(self):
+        data = json.loads(_make_line("user", "user", "hello"))
+        (msg,) = _convert_line(data)
+        payload = msg.to_payload()
+        assert payload == {"role": MessageRole.user, "type": "text", "content": "hello"}
+        assert MessageContent(**payload).content == "hello"
+
     def test_assistant_mixed_blocks(self):
         data = json.loads(
             _make_line(
@@ -165,6 +170,23 @@ class TestConvertLine:
         data = {"type": "progress", "sessionId": "abc"}
         assert _convert_line(data) is None
 
+    def test_skip_non_string_line_type(self):
+        data = {"type": ["user"], "message": {"role": "user", "content": "hi"}}
+        assert _convert_line(data) is None
+        assert parse_jsonl_lines([data]).messages == []
+
+    def test_skip_non_string_role_and_block_type(self):
+        data = {"type": "user", "message": {"role": ["user"], "content": []}}
+        assert _convert_line(data) is None
+        data = json.loads(
+            _make_line(
+                "assistant",
+                "assistant",
+                [{"type": ["text"], "text": "x"}, {"type": "text", "text": "kept"}],
+            )
+        )
+        assert [m.content for m in _convert_line(data)] == ["kept"]
+
     def test_assistant_thinking_skipped(self):
         """Thinking blocks should be skipped (not text or tool_use)."""
         data = json.loads(
@@ -245,6 +267,35 @@ class TestConsolidateMessages:
         assert "Q1" in result[0].content
         assert "Q2" in result[0].content
 
+    def test_merges_long_run_and_splits_on_tool_use(self):
+        msgs = [
+            MessageContent(role=MessageRole.assistant, type="text", content="a"),
+            MessageContent(role=MessageRole.assistant, type="text", content=None),
+            MessageContent(role=MessageRole.assistant, type="text", content="c"),
+            MessageContent(
+                role=MessageRole.assistant, type="tool_use",
+                tool_name="Read", tool_input={}, tool_use_id="t1",
+            ),
+            MessageContent(role=MessageRole.assistant, type="text", content="d"),
+        ]
+        result = _consolidate_messages(msgs)
+        assert [m.type for m in result] == ["text", "tool_use", "text"]
+        assert result[0].content == "a\n\n\n\nc"
+        assert result[2] is msgs[4]
+
+    def test_orphan_tool_result_dropped(self):
+        msgs = [
+            MessageContent(role=MessageRole.user, type="text", content="Q"),
+            MessageContent(
+                role=MessageRole.tool, type="tool_result",
+                content="stale", tool_use_id="gone",
+            ),
+            MessageContent(role=MessageRole.user, type="text", content="Q2"),
+        ]
+        result = _consolidate_messages(msgs)
+        assert len(result) == 1
+        assert result[0].content == "Q\n\nQ2"
+
     def test_does_not_merge_different_roles(self):
         msgs = [
             MessageContent(role=MessageRole.user, type="text", content="Q"),
@@ -392,6 +443,20 @@ class TestParseJsonlLines:
         assert result.metadata.session_id == "target"
         assert len(result.messages) == 1
 
+    def test_metadata_taken_from_primary_session(self):
+        """A stray session appearing first must not leak its cwd or first
+        message into the primary session's metadata."""
+        lines = [
+            _make_line("user", "user", "stray", session_id="other", cwd="/stray"),
+            _make_line("user", "user", "main msg", session_id="main"),
+            _make_line("user", "user", "follow-up", session_id="main"),
+        ]
+        result = parse_jsonl_lines(lines)
+        assert result.metadata.session_id == "main"
+        assert result.metadata.cwd == "/home/user/project"
+        assert result.metadata.first_user_message == "main msg"
+        assert [m.content for m in result.messages] == ["main msg\n\nfollow-up"]
+
     def test_bad_json_skipped(self):
         lines = [
             "not valid json{{{",
@@ -402,7 +467,7 @@ class TestParseJsonlLines:
 
 
 class TestParseJsonlFile:
-    def test_file_io(self):
+    def test_file_io(self, tmp_path):
         lines = [
             _make_line("user", "user", "from file"),
             _make_line(
@@ -411,31 +476,19 @@ class TestParseJsonlFile:
                 [{"type": "text", "text": "response"}],
             ),
         ]
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".jsonl", delete=False
-        ) as f:
-            for line in lines:
-                f.write(line + "\n")
-            path = f.name
-
-        try:
-            result = parse_jsonl_file(path)
-            assert len(result.messages) == 2
-            assert result.metadata.session_id == "sess-1"
-        finally:
-            Path(path).unlink()
-
-    def test_empty_file(self):
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".jsonl", delete=False
-        ) as f:
-            path = f.name
-
-        try:
-            result = parse_jsonl_file(path)
-            assert result.messages == []
-        finally:
-            Path(path).unlink()
+        path = tmp_path / "session.jsonl"
+        path.write_text("".join(line + "\n" for line in lines))
+
+        result = parse_jsonl_file(path)
+        assert len(result.messages) == 2
+        assert result.metadata.session_id == "sess-1"
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "session.jsonl"
+        path.write_text("")
+
+        result = parse_jsonl_file(path)
+        assert result.messages == []
 
     def test_filename_used_as_session_hint(self, tmp_path):
         """The filename stem should be used to resolve the correct session."""
@@ -455,3 +508,54 @@ class TestParseJsonlFile:
         result = parse_jsonl_file(path)
         assert result.metadata.session_id == "target-id"
         assert len(result.messages) == 2
+
+    def test_stray_sessions_not_converted(self, tmp_path, monkeypatch):
+        """Lines that can't belong to the filename's session are skipped
+        before decoding; a stem that isn't a session id falls back to a
+        full parse."""
+        converted = []
+
+        def spy(data):
+            converted.append(data["sessionId"])
+            return _convert_line(data)
+
+        monkeypatch.setattr("server.jsonl_parser._convert_line", spy)
+        lines = [
+            _make_line("user", "user", "stray", session_id="other-id"),
+            _make_line("user", "user", "stray 2", session_id="other-id"),
+            _make_line("user", "user", "real msg", session_id="target-id"),
+        ]
+        path = tmp_path / "target-id.jsonl"
+        path.write_text("\n".join(lines) + "\n")
+        result = parse_jsonl_file(path)
+        assert result.metadata.session_id == "target-id"
+        assert converted == ["target-id"]
+
+        converted.clear()
+        renamed = tmp_path / "renamed.jsonl"
+        path.rename(renamed)
+        result = parse_jsonl_file(renamed)
+        assert result.metadata.session_id == "other-id"
+        assert [m.content for m in result.messages] == ["stray\n\nstray 2"]
+
+    def test_lines_spanning_read_chunks(self, tmp_path, monkeypatch):
+        """Lines split across chunk reads (and a missing trailing newline)
+        must reassemble intact."""
+        monkeypatch.setattr("server.jsonl_parser._READ_CHUNK_SIZE", 7)
+        lines = [
+            _make_line("user", "user", "héllo across chunks"),
+            "",
+            _make_line(
+                "assistant",
+                "assistant",
+                [{"type": "text", "text": "reply " * 20}],
+            ),
+        ]
+        path = tmp_path / "sess-1.jsonl"
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        result = parse_jsonl_file(path)
+        assert [m.content for m in result.messages] == [
+            "héllo across chunks",
+            "reply " * 20,
+        ]
@@ -112,6 +112,37 @@ async def test_send_message_unknown_session(manager):
             pass
 
 
+@pytest.mark.asyncio
+async def test_send_message_returns_to_idle_when_flush_fails(manager, monkeypatch):
+    from server.harness import HarnessEvent
+
+    session = await _new(manager, "Flaky DB")
+
+    class Backend:
+        async def start(self, prompt, working_dir, resume_id=None, credential=None):
+            pass
+
+        def stream(self):
+            async def _gen():
+                yield HarnessEvent(type="text", content="ok")
+
+            return _gen()
+
+        async def stop(self):
+            pass
+
+    manager._make_run = lambda s, agent=None, connectors=None: Backend()
+
+    async def failing_flush():
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(manager.db, "flush", failing_flush)
+    with pytest.raises(RuntimeError, match="disk full"):
+        async for _ in manager.send_message(session.id, "hello"):
+            pass
+    assert session.status == SessionStatus.idle
+
+
 @pytest.mark.asyncio
 async def test_broadcast_registration(manager):
     calls = []
@@ -1882,3 +1913,73 @@ async def test_turn_overall_cap_trips_even_with_steady_events(manager, monkeypat
     assert timeout is not None
     assert "maximum duration" in timeout["message"]  # the overall-cap message
     assert backend.stopped is True
+
+
+@pytest.mark.asyncio
+async def test_broadcast_listeners_run_concurrently(manager):
+    """A slow or failing listener neither serializes nor blocks the others."""
+    fast_got: list[dict] = []
+    slow_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow(msg):
+        slow_started.set()
+        await release.wait()
+
+    async def failing(msg):
+        raise RuntimeError("boom")
+
+    async def fast(msg):
+        # Runs while `slow` is still parked on its send.
+        await slow_started.wait()
+        fast_got.append(msg)
+        release.set()
+
+    manager.on_broadcast("slow", slow)
+    manager.on_broadcast("failing", failing)
+    manager.on_broadcast("fast", fast)
+    await asyncio.wait_for(manager._broadcast({"type": "ping"}), timeout=2)
+    assert fast_got == [{"type": "ping"}]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_frame_sinks_share_one_encoding(manager):
+    frames_a: list[str] = []
+    frames_b: list[str] = []
+    dicts: list[dict] = []
+
+    async def listener(msg):
+        dicts.append(msg)
+
+    manager.on_broadcast_frame("a", frames_a.append)
+    manager.on_broadcast_frame("b", frames_b.append)
+    manager.on_broadcast("dict", listener)
+    await manager._broadcast({"type": "status", "status": "idle"})
+
+    assert frames_a == ['{"type":"status","status":"idle"}']
+    assert frames_b[0] is frames_a[0]
+    assert dicts == [{"type": "status", "status": "idle"}]
+
+    manager.remove_broadcast("a")
+    await manager._broadcast({"type": "ping"})
+    assert len(frames_a) == 1 and len(frames_b) == 2
+
+
+@pytest.mark.asyncio
+async def test_status_broadcast_only_on_change(manager):
+    session = await _new(manager)
+    statuses: list[str] = []
+
+    async def listener(msg):
+        if msg.get("type") == "status":
+            statuses.append(msg["status"])
+
+    manager.on_broadcast("l", listener)
+    await manager.reset_session(session.id)
+    await manager.reset_session(session.id)
+    assert statuses == ["idle"]
+
+    await manager._set_status(session, SessionStatus.running)
+    await manager.reset_session(session.id)
+    assert session.status is SessionStatus.idle
+    assert statuses == ["idle", "running", "idle"]
@@ -0,0 +1,332 @@
+"""WebSocket endpoint: the per-connection outbox writer and client message
+dispatch."""
+
+import asyncio
+
+import orjson
+import pytest
+from fastapi import WebSocketDisconnect
+
+from server.routers import ws as ws_router
+from server.session_manager import session_manager
+
+
+class FakeWebSocket:
+    def __init__(self, fail_with: BaseException | None = None):
+        self.sent: list[str] = []
+        self.closed: tuple[int, str] | None = None
+        self._fail_with = fail_with
+
+    async def send_text(self, text: str) -> None:
+        if self._fail_with is not None:
+            raise self._fail_with
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed = (code, reason)
+
+
+@pytest.fixture
+def conn_id():
+    key = "test-conn"
+    session_manager.on_broadcast_frame(key, lambda frame: None)
+    yield key
+    session_manager.remove_broadcast(key)
+
+
+@pytest.mark.asyncio
+async def test_queued_frames_coalesce_into_one_batch(conn_id):
+    ws = FakeWebSocket()
+    outbox: asyncio.Queue[str | None] = asyncio.Queue()
+    for i in range(3):
+        outbox.put_nowait(ws_router._encode({"type": "text", "n": i}))
+
+    writer = asyncio.create_task(
+        ws_router._drain_outbox(ws, outbox, conn_id, batch=True)
+    )
+    await asyncio.sleep(0)
+    writer.cancel()
+
+    assert len(ws.sent) == 1
+    assert orjson.loads(ws.sent[0]) == {
+        "type": "batch",
+        "events": [{"type": "text", "n": i} for i in range(3)],
+    }
+    assert ws.closed is None
+
+
+@pytest.mark.asyncio
+async def test_queued_frames_sent_one_by_one_without_batch_opt_in(conn_id):
+    # Clients built before batch frames existed would drop their events.
+    ws = FakeWebSocket()
+    outbox: asyncio.Queue[str | None] = asyncio.Queue()
+    for i in range(3):
+        outbox.put_nowait(ws_router._encode({"n": i}))
+    outbox.put_nowait(None)
+
+    await ws_router._drain_outbox(ws, outbox, conn_id)
+    assert ws.sent == ['{"n":0}', '{"n":1}', '{"n":2}']
+    assert ws.closed == (1013, "Client too slow")
+
+
+@pytest.mark.asyncio
+async def test_lone_frame_is_sent_unwrapped(conn_id):
+    ws = FakeWebSocket()
+    outbox: asyncio.Queue[str | None] = asyncio.Queue()
+    writer = asyncio.create_task(ws_router._drain_outbox(ws, outbox, conn_id))
+    outbox.put_nowait(ws_router._encode({"type": "text"}))
+    await asyncio.sleep(0)
+    writer.cancel()
+
+    assert ws.sent == ['{"type":"text"}']
+
+
+@pytest.mark.asyncio
+async def test_full_outbox_closes_with_1013(conn_id):
+    ws = FakeWebSocket()
+    outbox: asyncio.Queue[str | None] = asyncio.Queue(maxsize=2)
+    for i in range(3):
+        ws_router._enqueue(outbox, conn_id, ws_router._encode({"n": i}))
+
+    # Overflow drops the backlog and stops broadcasts to this client.
+    assert outbox.qsize() == 1
+    assert conn_id not in session_manager._frame_sinks
+
+    await ws_router._drain_outbox(ws, outbox, conn_id)
+    assert ws.sent == []
+    assert ws.closed == (1013, "Client too slow")
+
+
+@pytest.mark.asyncio
+async def test_overflow_flushes_batch_before_closing(conn_id):
+    ws = FakeWebSocket()
+    outbox: asyncio.Queue[str | None] = asyncio.Queue()
+    outbox.put_nowait('{"n":0}')
+    outbox.put_nowait('{"n":1}')
+    outbox.put_nowait(None)
+
+    await ws_router._drain_outbox(ws, outbox, conn_id, batch=True)
+    assert ws.sent == ['{"type":"batch","events":[{"n":0},{"n":1}]}']
+    assert ws.closed == (1013, "Client too slow")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [WebSocketDisconnect(), RuntimeError("send after close")]
+)
+async def test_dead_socket_drops_broadcast_sink(conn_id, error):
+    ws = FakeWebSocket(fail_with=error)
+    outbox: asyncio.Queue[str | None] = asyncio.Queue()
+    outbox.put_nowait('{"type":"text"}')
+
+    await ws_router._drain_outbox(ws, outbox, conn_id)
+    assert conn_id not in session_manager._frame_sinks
+    assert ws.closed is None
+
+
+@pytest.mark.asyncio
+async def test_unexpected_send_error_is_logged_and_closes(conn_id, caplog):
+    ws = FakeWebSocket(fail_with=ValueError("boom"))
+    outbox: asyncio.Queue[str | None] = asyncio.Queue()
+    outbox.put_nowait('{"type":"text"}')
+
+    await ws_router._drain_outbox(ws, outbox, conn_id)
+    assert conn_id not in session_manager._frame_sinks
+    assert ws.closed == (1011, "Internal error")
+    assert "WebSocket writer failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_cancelled_writer_drops_broadcast_sink(conn_id):
+    ws = FakeWebSocket()
+    outbox: asyncio.Queue[str | None] = asyncio.Queue()
+    writer = asyncio.create_task(ws_router._drain_outbox(ws, outbox, conn_id))
+    await asyncio.sleep(0)
+    writer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await writer
+    assert conn_id not in session_manager._frame_sinks
+
+
+# --- client message dispatch -------------------------------------------------
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Stub the session_manager entry points the handlers call. Each stub
+    records its arguments; the approve/deny/answer stubs report "nothing
+    pending" for ids starting with "missing"."""
+    recorded: list[tuple] = []
+
+    async def start_message(session_id, content, attachment_ids=None):
+        recorded.append(("start_message", session_id, content, attachment_ids))
+        if session_id == "missing":
+            raise ValueError("Session missing not found")
+
+    async def interrupt(session_id):
+        recorded.append(("interrupt", session_id))
+        return True
+
+    async def approve_tool(session_id, tool_use_id):
+        recorded.append(("approve_tool", session_id, tool_use_id))
+        return not tool_use_id.startswith("missing")
+
+    async def deny_tool(session_id, tool_use_id, reason=""):
+        recorded.append(("deny_tool", session_id, tool_use_id, reason))
+        return not tool_use_id.startswith("missing")
+
+    async def answer_question(session_id, question_id, answers):
+        recorded.append(("answer_question", session_id, question_id, answers))
+        return not question_id.startswith("missing")
+
+    for fn in (start_message, interrupt, approve_tool, deny_tool, answer_question):
+        monkeypatch.setattr(session_manager, fn.__name__, fn)
+    return recorded
+
+
+@pytest.fixture
+def client_ws():
+    from fastapi.testclient import TestClient
+
+    from server.main import app
+
+    with TestClient(app).websocket_connect("/ws?token=changeme&batch=1") as conn:
+        yield conn
+
+
+FENCE = {"type": "error", "message": "Invalid JSON"}
+
+
+def _exchange(conn, msg) -> dict:
+    """Send `msg`, then an invalid frame as a fence: the first reply is the
+    handler's own if it sent one, else the fence's Invalid JSON error."""
+    conn.send_text(orjson.dumps(msg).decode())
+    conn.send_text("{not json")
+    replies: list[dict] = []
+    while FENCE not in replies:
+        frame = conn.receive_json()
+        replies.extend(frame["events"] if frame["type"] == "batch" else [frame])
+    assert replies[-1] == FENCE and len(replies) <= 2
+    return replies[0]
+
+
+def test_send_message_dispatch(client_ws, calls):
+    msg = {
+        "type": "send_message",
+        "session_id": "s1",
+        "content": "hi",
+        "attachment_ids": ["a1", 7, "a2"],
+    }
+    assert _exchange(client_ws, msg) == FENCE
+    assert calls == [("start_message", "s1", "hi", ["a1", "a2"])]
+
+    # Attachment-only turns are allowed; a non-list attachment_ids is ignored.
+    msg = {"type": "send_message", "session_id": "s1", "attachment_ids": ["a1"]}
+    assert _exchange(client_ws, msg) == FENCE
+    msg = {"type": "send_message", "session_id": "s1", "content": "x",
+           "attachment_ids": "a1"}
+    assert _exchange(client_ws, msg) == FENCE
+    assert calls[1:] == [
+        ("start_message", "s1", "", ["a1"]),
+        ("start_message", "s1", "x", []),
+    ]
+
+
+@pytest.mark.parametrize(
+    "msg",
+    [
+        {"type": "send_message", "content": "hi"},
+        {"type": "send_message", "session_id": "s1"},
+        {"type": "send_message", "session_id": "s1", "content": "",
+         "attachment_ids": []},
+    ],
+)
+def test_send_message_requires_session_and_content(client_ws, calls, msg):
+    assert _exchange(client_ws, msg) == {
+        "type": "error",
+        "message": "session_id and content required",
+    }
+    assert calls == []
+
+
+def test_send_message_value_error_is_reported(client_ws, calls):
+    msg = {"type": "send_message", "session_id": "missing", "content": "hi"}
+    assert _exchange(client_ws, msg) == {
+        "type": "error",
+        "session_id": "missing",
+        "message": "Session missing not found",
+    }
+
+
+def test_interrupt_dispatch(client_ws, calls):
+    assert _exchange(client_ws, {"type": "interrupt", "session_id": "s1"}) == FENCE
+    assert _exchange(client_ws, {"type": "interrupt"}) == FENCE
+    assert calls == [("interrupt", "s1")]
+
+
+@pytest.mark.parametrize("kind", ["approve_tool", "deny_tool"])
+def test_tool_decision_dispatch(client_ws, calls, kind):
+    msg = {"type": kind, "session_id": "s1", "tool_use_id": "t1"}
+    assert _exchange(client_ws, msg) == FENCE
+
+    msg = {"type": kind, "session_id": "s1", "tool_use_id": "missing-t"}
+    assert _exchange(client_ws, msg) == {
+        "type": "error",
+        "session_id": "s1",
+        "message": "No pending approval found",
+    }
+
+    # Incomplete requests are dropped silently.
+    assert _exchange(client_ws, {"type": kind, "session_id": "s1"}) == FENCE
+    assert [c[:3] for c in calls] == [
+        (kind, "s1", "t1"),
+        (kind, "s1", "missing-t"),
+    ]
+
+
+def test_deny_tool_passes_reason(client_ws, calls):
+    msg = {"type": "deny_tool", "session_id": "s1", "tool_use_id": "t1",
+           "reason": "nope"}
+    assert _exchange(client_ws, msg) == FENCE
+    assert calls == [("deny_tool", "s1", "t1", "nope")]
+
+
+def test_answer_question_dispatch(client_ws, calls):
+    msg = {"type": "answer_question", "session_id": "s1", "question_id": "q1",
+           "answers": ["yes"]}
+    assert _exchange(client_ws, msg) == FENCE
+
+    msg = {"type": "answer_question", "session_id": "s1",
+           "question_id": "missing-q", "answers": []}
+    assert _exchange(client_ws, msg) == {
+        "type": "error",
+        "session_id": "s1",
+        "message": "No pending question found",
+    }
+
+    # answers must be a list.
+    msg = {"type": "answer_question", "session_id": "s1", "question_id": "q1",
+           "answers": "yes"}
+    assert _exchange(client_ws, msg) == FENCE
+    assert calls == [
+        ("answer_question", "s1", "q1", ["yes"]),
+        ("answer_question", "s1", "missing-q", []),
+    ]
+
+
+@pytest.mark.parametrize("kind", ["bogus", None, ["send_message"], {"a": 1}])
+def test_unknown_message_type_is_ignored(client_ws, calls, kind):
+    msg = {"type": kind, "session_id": "s1", "content": "hi"}
+    assert _exchange(client_ws, msg) == FENCE
+    assert calls == []
+
+
+def test_endpoint_without_batch_param_sends_plain_frames(calls):
+    from fastapi.testclient import TestClient
+
+    from server.main import app
+
+    with TestClient(app).websocket_connect("/ws?token=changeme") as conn:
+        for _ in range(3):
+            conn.send_text("{not json")
+        assert [conn.receive_json() for _ in range(3)] == [FENCE] * 3
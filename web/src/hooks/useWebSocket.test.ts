@@ -1,6 +1,6 @@
 import { describe, expect, it } from "vitest";
 
-import { shouldApplyWsEvent } from "./useWebSocket";
+import { shouldApplyWsEvent, unpackWsFrame } from "./useWebSocket";
 
 /** Snapshot-baseline dedup primitive.
  *
@@ -39,3 +39,24 @@ describe("shouldApplyWsEvent", () => {
     expect(shouldApplyWsEvent(1, 0)).toBe(true);
   });
 });
+
+describe("unpackWsFrame", () => {
+  it("returns a plain event frame as a single event", () => {
+    const frame = { type: "message", session_id: "s1", seq: 3 };
+    expect(unpackWsFrame(frame)).toEqual([frame]);
+  });
+
+  it("unpacks a batch frame into its events, in order", () => {
+    const events = [
+      { type: "status", session_id: "s1", status: "running" },
+      { type: "assistant_text", session_id: "s1", content: "hi", seq: 4 },
+      { type: "result", session_id: "s1", seq: 5 },
+    ];
+    expect(unpackWsFrame({ type: "batch", events })).toEqual(events);
+  });
+
+  it("treats a batch frame without an events array as a single event", () => {
+    const frame = { type: "batch", events: "nope" };
+    expect(unpackWsFrame(frame)).toEqual([frame]);
+  });
+});
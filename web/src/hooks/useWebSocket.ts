@@ -39,6 +39,22 @@ export function shouldApplyWsEvent(
   return seq > b;
 }
 
+/** Events carried by one WS frame.
+ *
+ * We connect with `batch=1`, so the server may coalesce a burst of events
+ * into a single `{"type": "batch", "events": [...]}` frame; any other frame
+ * is a single event.
+ *
+ * Exported only so the unit tests can exercise it directly.
+ */
+export function unpackWsFrame(
+  data: Record<string, unknown>
+): Record<string, unknown>[] {
+  return data.type === "batch" && Array.isArray(data.events)
+    ? (data.events as Record<string, unknown>[])
+    : [data];
+}
+
 function handleWsMessage(data: Record<string, unknown>) {
   const {
     addMessage,
@@ -371,7 +387,11 @@ export function useWebSocket() {
       if (wsRef.current?.readyState === WebSocket.OPEN ||
           wsRef.current?.readyState === WebSocket.CONNECTING) return;
 
-      const ws = new WebSocket(`${WS_URL}?token=${encodeURIComponent(token)}`);
+      // batch=1 opts in to batch frames (see unpackWsFrame); clients that
+      // don't ask get one frame per event.
+      const ws = new WebSocket(
+        `${WS_URL}?token=${encodeURIComponent(token)}&batch=1`
+      );
       wsRef.current = ws;
 
       ws.onopen = () => {
@@ -454,10 +474,18 @@ export function useWebSocket() {
       };
 
       ws.onmessage = (e) => {
+        let data: Record<string, unknown>;
         try {
-          handleWsMessage(JSON.parse(e.data));
+          data = JSON.parse(e.data);
         } catch {
-          // ignore
+          return;
+        }
+        for (const event of unpackWsFrame(data)) {
+          try {
+            handleWsMessage(event);
+          } catch {
+            // ignore
+          }
         }
       };
     }